@@ -1,21 +1,24 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+import hashlib
+import hmac
 import os
-from dotenv import load_dotenv
-from database import get_db, User
+import secrets
+import config  # noqa: F401  (loads .env before SECRET_KEY is read)
+from database import get_db, engine, User, RefreshToken
 import uuid
 
-load_dotenv()
-
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -34,11 +37,82 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def hash_refresh_token(token: str) -> str:
+    # Refresh tokens are 256-bit random values, so a keyed fast hash is enough; bcrypt would waste CPU
+    return hmac.new(SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+def create_refresh_token(db: Session, user_id: str, family_id: Optional[str] = None) -> Tuple[str, RefreshToken]:
+    token = secrets.token_urlsafe(32)
+    record = RefreshToken(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        family_id=family_id or str(uuid.uuid4()),
+        token_hash=hash_refresh_token(token),
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(record)
+    db.commit()
+    return token, record
+
+def revoke_token_family(db: Session, family_id: str):
+    db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at == None
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[Tuple[str, str]]:
+    """Exchange a refresh token for (user_id, new refresh token), or None if it is not usable.
+    
+    Presenting an already-rotated token means it leaked, so the whole family is revoked.
+    Pass a primary session: a replica may not have the token yet, or its revocation.
+    """
+    record = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_refresh_token(token)).first()
+    if not record:
+        return None
+    if record.revoked_at is not None:
+        revoke_token_family(db, record.family_id)
+        return None
+    if record.expires_at < datetime.utcnow():
+        return None
+    
+    # Conditional update so two concurrent refreshes of one token can't both succeed
+    claimed = db.query(RefreshToken).filter(
+        RefreshToken.id == record.id,
+        RefreshToken.revoked_at == None
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+    if not claimed:
+        db.rollback()
+        revoke_token_family(db, record.family_id)
+        return None
+    
+    new_token, new_record = create_refresh_token(db, record.user_id, record.family_id)
+    db.query(RefreshToken).filter(RefreshToken.id == record.id).update(
+        {"replaced_by": new_record.id}, synchronize_session=False
+    )
+    db.commit()
+    return record.user_id, new_token
+
+def revoke_refresh_token(db: Session, token: str) -> bool:
+    record = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_refresh_token(token)).first()
+    if not record:
+        return False
+    revoke_token_family(db, record.family_id)
+    return True
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    deleted = db.query(RefreshToken).filter(
+        RefreshToken.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
 def verify_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -61,7 +135,10 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Lets the routing session keep this user's reads on the primary right after they write
+    db.info["user_id"] = user_id
+    # A primary-key read on the primary, so a user who just registered isn't rejected by a lagging replica
+    user = db.execute(select(User).where(User.id == user_id), bind_arguments={"bind": engine}).scalars().first()
     if user is None:
         raise credentials_exception
     
@@ -95,6 +172,8 @@ def create_user(db: Session, email: str, password: str, name: str):
     )
     
     db.add(user)
+    # Marks the new user as a recent writer on commit, so their next requests read from the primary
+    db.info["user_id"] = user_id
     db.commit()
     db.refresh(user)
     return user
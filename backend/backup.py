@@ -0,0 +1,224 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from cluster import singleton
+from database import engine
+from scheduler import in_background, scheduler
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./backups")
+BACKUP_INTERVAL_HOURS = int(os.getenv("BACKUP_INTERVAL_HOURS", "24"))  # 0 disables scheduled backups
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+# Pages copied per step, and the pause after each step during which writers can take the lock
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_SECONDS = float(os.getenv("BACKUP_STEP_SLEEP_SECONDS", "0.01"))
+BACKUP_MAX_RESTARTS = int(os.getenv("BACKUP_MAX_RESTARTS", "3"))
+# Without WAL: how often to back off and start over when writes keep restarting the copy
+BACKUP_MAX_ATTEMPTS = int(os.getenv("BACKUP_MAX_ATTEMPTS", "5"))
+BACKUP_RETRY_DELAY_SECONDS = float(os.getenv("BACKUP_RETRY_DELAY_SECONDS", "30"))
+
+
+def _database_path() -> Optional[str]:
+    if engine.dialect.name != "sqlite" or not engine.url.database or engine.url.database == ":memory:":
+        return None
+    return engine.url.database
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _copy_online(source_path: str, target_path: str):
+    """Copy a SQLite database with the online backup API, a few pages at a time.
+
+    Each step holds the read lock only briefly; sleeping between steps lets writers
+    in. A write from another connection makes SQLite restart the copy, so the result
+    is always a consistent snapshot. After BACKUP_MAX_RESTARTS restarts this raises
+    _TooManyRestarts rather than finishing in one step, which would hold the lock
+    (and block every writer) for the rest of the copy.
+    """
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status, remaining, total):
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > BACKUP_MAX_RESTARTS:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        time.sleep(BACKUP_STEP_SLEEP_SECONDS)
+
+    try:
+        with target:
+            source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=progress)
+    finally:
+        target.close()
+        source.close()
+
+
+def _journal_mode(path: str) -> str:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("PRAGMA journal_mode").fetchone()[0].lower()
+    finally:
+        connection.close()
+
+
+def _snapshot(source_path: str, target_path: str):
+    """Write a consistent copy of the live database without stalling API writes.
+
+    In WAL mode (the default, see SQLITE_WAL) VACUUM INTO copies inside a single
+    read transaction, and writers carry on appending to the WAL meanwhile. In
+    rollback-journal mode a reader does block writers, so the copy goes in small
+    steps, and under sustained writes it backs off and starts over.
+    """
+    if _journal_mode(source_path) == "wal":
+        source = sqlite3.connect(source_path)
+        try:
+            source.execute("VACUUM INTO ?", (target_path,))
+        finally:
+            source.close()
+        return
+
+    for attempt in range(1, BACKUP_MAX_ATTEMPTS + 1):
+        try:
+            _copy_online(source_path, target_path)
+            return
+        except _TooManyRestarts:
+            os.remove(target_path)
+            if attempt == BACKUP_MAX_ATTEMPTS:
+                break
+            print(f"⚠️  Backup restarted {BACKUP_MAX_RESTARTS} times under write load; "
+                  f"retrying in {BACKUP_RETRY_DELAY_SECONDS:.0f}s")
+            time.sleep(BACKUP_RETRY_DELAY_SECONDS)
+    raise RuntimeError(f"Backup kept restarting under write load after {BACKUP_MAX_ATTEMPTS} attempts")
+
+
+def _integrity_ok(path: str) -> bool:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    finally:
+        connection.close()
+
+
+def list_backups() -> List[str]:
+    return sorted(glob.glob(os.path.join(BACKUP_DIR, "aria-*.db.gz")))
+
+
+def backup_database() -> Optional[str]:
+    """Take a compressed, verified snapshot of the SQLite database and rotate old ones."""
+    source_path = _database_path()
+    if not source_path:
+        print("⚠️  Online backups are only supported for file-based SQLite databases")
+        return None
+
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    started = time.monotonic()
+    name = f"aria-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.db.gz"
+    target_path = os.path.join(BACKUP_DIR, name)
+
+    with tempfile.TemporaryDirectory(dir=BACKUP_DIR) as workdir:
+        snapshot = os.path.join(workdir, "snapshot.db")
+        _snapshot(source_path, snapshot)
+        if not _integrity_ok(snapshot):
+            raise RuntimeError("Backup snapshot failed integrity check")
+        with open(snapshot, "rb") as src, gzip.open(target_path + ".tmp", "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        checksum = _sha256(snapshot)
+
+    os.replace(target_path + ".tmp", target_path)
+    with open(target_path + ".sha256", "w") as f:
+        f.write(checksum + "\n")
+
+    if BACKUP_KEEP:
+        for old in list_backups()[:-BACKUP_KEEP]:
+            os.remove(old)
+            if os.path.exists(old + ".sha256"):
+                os.remove(old + ".sha256")
+
+    print(f"💾 Backup written to {target_path} in {time.monotonic() - started:.1f}s")
+    return target_path
+
+
+def _decompress(backup_path: str, target_path: str):
+    with gzip.open(backup_path, "rb") as src, open(target_path, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def verify_backup(backup_path: str) -> bool:
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot = os.path.join(workdir, "snapshot.db")
+        try:
+            _decompress(backup_path, snapshot)
+            if os.path.exists(backup_path + ".sha256"):
+                with open(backup_path + ".sha256") as f:
+                    if f.read().strip() != _sha256(snapshot):
+                        return False
+            return _integrity_ok(snapshot)
+        except (OSError, EOFError, sqlite3.DatabaseError):
+            return False
+
+
+def restore_backup(backup_path: str, target_path: Optional[str] = None):
+    """Restore a verified backup over the target database (stop the API first)."""
+    target_path = target_path or _database_path()
+    if not target_path:
+        raise RuntimeError("No SQLite target database to restore into")
+    if not verify_backup(backup_path):
+        raise RuntimeError(f"{backup_path} failed verification; not restoring")
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot = os.path.join(workdir, "snapshot.db")
+        _decompress(backup_path, snapshot)
+        # The backup API writes through SQLite's locking, unlike copying over the file
+        _copy_online(snapshot, target_path)
+    print(f"♻️  Restored {backup_path} into {target_path}")
+
+
+def schedule_backups():
+    if BACKUP_INTERVAL_HOURS and _database_path():
+        scheduler.every(BACKUP_INTERVAL_HOURS).hours.do(
+            in_background("backup", singleton("backup", backup_database))
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Online backups of the ARIA SQLite database")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("backup", help="take a backup now")
+    subcommands.add_parser("list", help="list existing backups")
+    verify_parser = subcommands.add_parser("verify", help="check a backup's checksum and integrity")
+    verify_parser.add_argument("path")
+    restore_parser = subcommands.add_parser("restore", help="restore a backup (stop the API first)")
+    restore_parser.add_argument("path")
+    restore_parser.add_argument("--target", help="database file to restore into (defaults to DATABASE_URL)")
+    args = parser.parse_args()
+
+    if args.command == "backup":
+        backup_database()
+    elif args.command == "list":
+        for path in list_backups():
+            print(path)
+    elif args.command == "verify":
+        ok = verify_backup(args.path)
+        print("✅ Backup is valid" if ok else "❌ Backup is corrupt")
+        raise SystemExit(0 if ok else 1)
+    elif args.command == "restore":
+        restore_backup(args.path, args.target)
@@ -0,0 +1,302 @@
+"""Load-test harness for the ARIA API.
+
+Seeds a synthetic dataset into a throwaway SQLite database, stubs GitHub locally
+(SMTP stays unconfigured so the email service short-circuits), starts uvicorn with
+each requested worker count and drives the API with an asyncio/httpx client.
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run_benchmarks --workers 1,2,4 --output bench_report.json
+    python -m benchmarks.run_benchmarks --baseline bench_report.json   # compare against a previous run
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Set
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.stubs import start_github_stub  # noqa: E402
+
+
+# Scenarios: each takes (client, account, i) and issues exactly one request
+async def scenario_login(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    return await client.post("/auth/login", json={"email": account["email"], "password": account["password"]})
+
+
+async def scenario_dashboard(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    project_id = account["projects"][i % len(account["projects"])]["id"]
+    paths = ["/projects", f"/repositories/{project_id}", f"/changelogs/{project_id}", f"/notifications/{project_id}"]
+    return await client.get(paths[i % len(paths)], headers=headers)
+
+
+async def scenario_repo_connect(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    project_id = account["projects"][i % len(account["projects"])]["id"]
+    return await client.post("/repositories/connect", headers=headers, json={
+        "project_id": project_id,
+        "repo_url": f"https://github.com/bench-connect/repo-{os.getpid()}-{time.time_ns()}-{i}",
+        "github_token": "stub-token",
+    })
+
+
+async def scenario_changelog_generate(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    project = account["projects"][i % len(account["projects"])]
+    repo_id = project["repo_ids"][i % len(project["repo_ids"])]
+    return await client.post("/changelogs/generate", headers=headers,
+                             params={"project_id": project["id"], "repo_id": repo_id})
+
+
+async def scenario_changelog_generate_range(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    project = account["projects"][i % len(account["projects"])]
+    repo_id = project["repo_ids"][i % len(project["repo_ids"])]
+    return await client.post("/changelogs/generate/range", headers=headers,
+                             params={"project_id": project["id"], "repo_id": repo_id, "base": "v1.0.0", "head": "v2.0.0"})
+
+
+async def scenario_changelog_export(client: httpx.AsyncClient, account: Dict, i: int) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    project_id = account["projects"][i % len(account["projects"])]["id"]
+    formats = ["markdown", "ndjson", "atom"]
+    return await client.get(f"/changelogs/{project_id}/export", headers=headers,
+                            params={"format": formats[i % len(formats)]})
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": scenario_login,
+    "dashboard": scenario_dashboard,
+    "repo_connect": scenario_repo_connect,
+    "changelog_generate": scenario_changelog_generate,
+    "changelog_generate_range": scenario_changelog_generate_range,
+    "changelog_export": scenario_changelog_export,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(base_url: str, name: str, accounts: List[Dict], requests: int,
+                       concurrency: int, warmup: int) -> Dict:
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    # Bytes on the wire (compressed when the server compresses), to track bandwidth per request
+    bytes_received = 0
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        for i in range(warmup):
+            await scenario(client, accounts[i % len(accounts)], i)
+
+        async def worker():
+            nonlocal errors, bytes_received
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    response = await scenario(client, accounts[i % len(accounts)], i)
+                    failed = response.status_code >= 400
+                    bytes_received += response.num_bytes_downloaded
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "bytes_per_request": round(bytes_received / requests) if requests else 0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+async def _answering_nodes(port: int, workers: int) -> Set[str]:
+    # A burst of requests on fresh connections, so the kernel hands them to different workers
+    async with httpx.AsyncClient(timeout=1, limits=httpx.Limits(max_keepalive_connections=0)) as client:
+        responses = await asyncio.gather(*(client.get(f"http://127.0.0.1:{port}/health") for _ in range(workers * 4)),
+                                         return_exceptions=True)
+    return {r.json()["node"] for r in responses if isinstance(r, httpx.Response) and r.status_code == 200}
+
+
+def wait_until_ready(process: subprocess.Popen, port: int, workers: int, timeout: float = 60) -> None:
+    """Block until `workers` distinct node ids have answered /health.
+
+    The first 200 only proves one worker is up; a worker that died during startup
+    would otherwise go unnoticed and the run would measure fewer workers than requested.
+    """
+    nodes: Set[str] = set()
+    deadline = time.time() + timeout
+    while len(nodes) < workers:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        if time.time() > deadline:
+            process.terminate()
+            raise RuntimeError(f"only {len(nodes)} of {workers} workers became healthy within {timeout:.0f}s")
+        nodes |= asyncio.run(_answering_nodes(port, workers))
+        if len(nodes) < workers:
+            time.sleep(0.02)
+
+
+def start_server(workers: int, port: int, env: Dict) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    wait_until_ready(process, port, workers)
+    return process
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare_reports(baseline: Dict, current: Dict):
+    previous = {(r["workers"], r["scenario"]): r for r in baseline["results"]}
+    print(f"\nComparison against {baseline['meta'].get('git_commit', 'baseline')[:12]}:")
+    for result in current["results"]:
+        old = previous.get((result["workers"], result["scenario"]))
+        if not old:
+            continue
+        rps_delta = (result["throughput_rps"] / old["throughput_rps"] - 1) * 100 if old["throughput_rps"] else 0.0
+        p95_delta = (result["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1) * 100 if old["latency_ms"]["p95"] else 0.0
+        print(f"  workers={result['workers']:<3} {result['scenario']:<20} "
+              f"throughput {rps_delta:+6.1f}%   p95 {p95_delta:+6.1f}%")
+
+
+def print_table(results: List[Dict]):
+    print(f"\n{'workers':>7}  {'scenario':<20} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['workers']:>7}  {r['scenario']:<20} {r['throughput_rps']:>9.1f} "
+              f"{lat['p50']:>8.1f} {lat['p95']:>8.1f} {lat['p99']:>8.1f} {r['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ARIA API")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated uvicorn worker counts")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects-per-user", type=int, default=2)
+    parser.add_argument("--repos-per-project", type=int, default=5)
+    parser.add_argument("--changelogs-per-repo", type=int, default=20)
+    parser.add_argument("--notifications-per-project", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", default="bench_report.json", help="where to write the JSON report")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    worker_counts = [int(w) for w in args.workers.split(",") if w]
+
+    workdir = tempfile.mkdtemp(prefix="aria-bench-")
+    github_stub = start_github_stub()
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "SECRET_KEY": env.get("SECRET_KEY", "benchmark-secret"),
+        "GITHUB_API_URL": f"http://127.0.0.1:{github_stub.server_port}",
+        "ARCHIVE_DIR": os.path.join(workdir, "archive"),
+        "SENDER_EMAIL": "",
+        "SENDER_PASSWORD": "",
+        # Measure raw capacity, not the configured per-client budgets
+        "RATE_LIMIT_ENABLED": "false",
+    })
+    # The seeding code imports the backend modules, which read their config at import time
+    os.environ.update(env)
+
+    from benchmarks.seed import seed_database
+
+    seed_started = time.perf_counter()
+    accounts = seed_database(args.users, args.projects_per_user, args.repos_per_project,
+                             args.changelogs_per_repo, args.notifications_per_project)
+    print(f"🌱 Seeded {len(accounts)} users in {time.perf_counter() - seed_started:.1f}s ({workdir})")
+
+    results = []
+    for workers in worker_counts:
+        process = start_server(workers, args.port, env)
+        try:
+            for name in scenarios:
+                result = asyncio.run(run_scenario(f"http://127.0.0.1:{args.port}", name, accounts,
+                                                  args.requests, args.concurrency, args.warmup))
+                result["workers"] = workers
+                results.append(result)
+                print(f"✅ workers={workers} {name}: {result['throughput_rps']} req/s, "
+                      f"p95 {result['latency_ms']['p95']} ms, {result['bytes_per_request']} B/req, {result['errors']} errors")
+        finally:
+            stop_server(process)
+    github_stub.shutdown()
+
+    report = {
+        "meta": {
+            "generated_at": datetime.utcnow().isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_table(results)
+    print(f"\n📄 Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_reports(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
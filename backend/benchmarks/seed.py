@@ -0,0 +1,70 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+BENCH_PASSWORD = "benchmark-password"
+
+
+def seed_database(users: int, projects_per_user: int, repos_per_project: int,
+                  changelogs_per_repo: int, notifications_per_project: int) -> List[Dict]:
+    """Populate the configured database with a synthetic dataset through the ORM models.
+
+    Must be called after DATABASE_URL points at the benchmark database. Returns one
+    entry per user with the credentials, token and ids the scenarios need.
+    """
+    from database import PrimarySessionLocal, User, Project, Repository, Changelog, Notification
+    from auth import get_password_hash, create_access_token
+    from migrations import migrate
+
+    # Records the schema version too, so the servers under test find it current
+    migrate()
+    db = PrimarySessionLocal()
+    # One bcrypt hash shared by every synthetic user keeps seeding fast
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+    accounts = []
+    try:
+        for u in range(users):
+            user = User(id=str(uuid.uuid4()), email=f"bench-{u}@example.com", name=f"Bench User {u}",
+                        hashed_password=hashed_password, created_at=now, last_login=now)
+            db.add(user)
+            account = {"email": user.email, "password": BENCH_PASSWORD, "user_id": user.id, "projects": []}
+            for p in range(projects_per_user):
+                project = Project(id=str(uuid.uuid4()), name=f"Project {u}-{p}", user_id=user.id,
+                                  github_token="stub-token", user_email=user.email,
+                                  created_at=now, updated_at=now, notification_types="[]")
+                db.add(project)
+                repo_ids = []
+                for r in range(repos_per_project):
+                    repo = Repository(id=str(uuid.uuid4()), owner=f"bench{u}", name=f"repo-{p}-{r}",
+                                      full_name=f"bench{u}/repo-{p}-{r}", project_id=project.id,
+                                      github_token="stub-token", last_checked=now)
+                    db.add(repo)
+                    repo_ids.append(repo.id)
+                    for c in range(changelogs_per_repo):
+                        db.add(Changelog(
+                            id=str(uuid.uuid4()), repo_id=repo.id, project_id=project.id,
+                            version=f"v1.{c}.0", title=f"Release 1.{c}.0", description="Synthetic release",
+                            features=json.dumps([f"Feature {i}" for i in range(5)]),
+                            fixes=json.dumps([f"Fix {i}" for i in range(5)]),
+                            improvements=json.dumps([]), breaking=json.dumps([]),
+                            generated_at=now - timedelta(days=c), pr_count=10,
+                        ))
+                for n in range(notifications_per_project):
+                    db.add(Notification(user_id=user.id, project_id=project.id, title=f"Notification {n}",
+                                        message="Synthetic notification", type="info",
+                                        timestamp=now - timedelta(hours=n), read=n % 2 == 0))
+                account["projects"].append({"id": project.id, "repo_ids": repo_ids})
+            accounts.append(account)
+            db.commit()
+    finally:
+        db.close()
+
+    # Seeding runs outside the app, so build the counters the API reads in one pass
+    from counters import reconcile_counters
+    reconcile_counters()
+
+    for account in accounts:
+        account["token"] = create_access_token(data={"sub": account["user_id"]}, expires_delta=timedelta(hours=12))
+    return accounts
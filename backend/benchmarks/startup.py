@@ -0,0 +1,119 @@
+"""Cold-start benchmark: how long until every worker of a fresh server answers /health.
+
+Compares plain `uvicorn --workers N` against `serve.py` (gunicorn master with a
+preloaded app forking Uvicorn workers) on a freshly created SQLite database.
+
+    cd backend
+    python -m benchmarks.startup --workers 1,4 --runs 5 --output startup_report.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.run_benchmarks import BACKEND_DIR, git_commit, stop_server, wait_until_ready
+from benchmarks.stubs import start_github_stub
+
+MODES = {
+    "uvicorn": lambda workers, port: [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+                                      "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+    "serve": lambda workers, port: [sys.executable, "serve.py", "--host", "127.0.0.1",
+                                    "--port", str(port), "--workers", str(workers)],
+}
+
+
+def measure_start(mode: str, workers: int, port: int, env: Dict) -> Dict:
+    started = time.perf_counter()
+    process = subprocess.Popen(MODES[mode](workers, port), cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Ready means every worker answers, not just the first one
+        wait_until_ready(process, port, workers)
+        ready = time.perf_counter() - started
+
+        # Catches any connection setup still left to the first requests
+        latencies = []
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+            for _ in range(20):
+                request_started = time.perf_counter()
+                client.get("/health")
+                latencies.append((time.perf_counter() - request_started) * 1000)
+        return {"ready_s": ready, "first_requests_max_ms": max(latencies)}
+    finally:
+        stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure ARIA API cold-start time")
+    parser.add_argument("--workers", default="1,4", help="comma-separated worker counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated modes to compare")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode and worker count")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", default="startup_report.json", help="where to write the JSON report")
+    args = parser.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="aria-startup-")
+    github_stub = start_github_stub()
+    env = dict(os.environ)
+    env.update({
+        "SECRET_KEY": env.get("SECRET_KEY", "benchmark-secret"),
+        "GITHUB_API_URL": f"http://127.0.0.1:{github_stub.server_port}",
+        "ARCHIVE_DIR": os.path.join(workdir, "archive"),
+        "SENDER_EMAIL": "",
+        "SENDER_PASSWORD": "",
+    })
+
+    results: List[Dict] = []
+    for workers in [int(w) for w in args.workers.split(",") if w]:
+        for mode in modes:
+            runs = []
+            for run in range(args.runs):
+                # A new database each run, so migrations are part of every cold start
+                env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, f'{mode}-{workers}-{run}.db')}"
+                runs.append(measure_start(mode, workers, args.port, env))
+            ready = sorted(r["ready_s"] for r in runs)
+            result = {
+                "mode": mode,
+                "workers": workers,
+                "runs": args.runs,
+                "ready_s": {"median": round(statistics.median(ready), 3), "min": round(ready[0], 3),
+                            "max": round(ready[-1], 3)},
+                "first_requests_max_ms": round(max(r["first_requests_max_ms"] for r in runs), 2),
+            }
+            results.append(result)
+            print(f"✅ {mode} workers={workers}: ready in {result['ready_s']['median']}s (median), "
+                  f"slowest early request {result['first_requests_max_ms']} ms")
+    github_stub.shutdown()
+
+    report = {
+        "meta": {
+            "generated_at": datetime.utcnow().isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Commits returned by the stubbed compare endpoint
+COMPARE_COMMITS = 120
+
+
+class GitHubStubHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the GitHub REST API endpoints the backend calls."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) == 5 and parts[0] == "repos" and parts[3:] == ["releases", "latest"]:
+            self._send(200, {"tag_name": "v2.0.0"})
+        elif len(parts) == 5 and parts[0] == "repos" and parts[3] == "compare":
+            self._send(200, {"commits": [
+                {"sha": f"{i:040x}", "commit": {"message": f"fix: synthetic change {i}"}}
+                for i in range(COMPARE_COMMITS)
+            ]})
+        elif len(parts) == 3 and parts[0] == "repos":
+            owner, name = parts[1], parts[2]
+            self._send(200, {
+                "full_name": f"{owner}/{name}",
+                "name": name,
+                "owner": {"login": owner},
+                "description": "Synthetic benchmark repository",
+            })
+        elif len(parts) == 3 and parts[0] == "orgs" and parts[2] == "repos":
+            org = parts[1]
+            self._send(200, [
+                {"full_name": f"{org}/repo-{i}", "name": f"repo-{i}", "owner": {"login": org}, "description": None}
+                for i in range(20)
+            ])
+        else:
+            self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/graphql":
+            self._send(404, {"message": "Not Found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        query = json.loads(self.rfile.read(length))["query"]
+        # Every other commit resolves to a merged PR
+        objects = re.findall(r'(c\d+): object\(oid: "(\w+)"\)', query)
+        repository = {
+            alias: {"associatedPullRequests": {"nodes": [
+                {"number": int(sha, 16) + 1, "title": f"feat: synthetic feature {sha[-4:]}", "body": "",
+                 "url": "", "mergedAt": "2024-01-01T00:00:00Z", "labels": {"nodes": []}}
+            ] if int(sha, 16) % 2 == 0 else []}}
+            for alias, sha in objects
+        }
+        self._send(200, {"data": {"repository": repository}})
+
+
+def start_github_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GitHubStubHandler)
+    threading.Thread(target=server.serve_forever, name="github-stub", daemon=True).start()
+    return server
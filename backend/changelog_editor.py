@@ -0,0 +1,61 @@
+import json
+from typing import Dict, List
+
+from database import Changelog
+from json_patch import JsonPatchError, apply_patch
+
+TEXT_FIELDS = ["version", "title", "description"]
+LIST_FIELDS = ["features", "fixes", "improvements", "breaking"]
+
+
+class RevisionConflict(Exception):
+    def __init__(self, current_revision: int):
+        super().__init__(f"Changelog was modified concurrently (current revision {current_revision})")
+        self.current_revision = current_revision
+
+
+def editable_document(changelog: Changelog) -> Dict:
+    """The JSON document patches are applied to: only user-editable fields, lists decoded."""
+    document = {field: getattr(changelog, field) or "" for field in TEXT_FIELDS}
+    for field in LIST_FIELDS:
+        value = getattr(changelog, field)
+        document[field] = json.loads(value) if value else []
+    return document
+
+
+def _validate(document: Dict):
+    if set(document) != set(TEXT_FIELDS + LIST_FIELDS):
+        raise JsonPatchError("Patch may only modify existing changelog fields")
+    for field in TEXT_FIELDS:
+        if not isinstance(document[field], str):
+            raise JsonPatchError(f"{field} must be a string")
+    for field in LIST_FIELDS:
+        if not isinstance(document[field], list) or not all(isinstance(item, str) for item in document[field]):
+            raise JsonPatchError(f"{field} must be a list of strings")
+
+
+def patch_changelog(db, changelog: Changelog, expected_revision: int, operations: List[Dict]) -> Dict:
+    """Apply RFC 6902 operations if the stored revision still matches; returns the new document.
+
+    The revision check is a conditional UPDATE, so of two editors patching the same
+    revision exactly one wins and the other gets a RevisionConflict to rebase on.
+    """
+    if changelog.revision != expected_revision:
+        raise RevisionConflict(changelog.revision)
+
+    document = apply_patch(editable_document(changelog), operations)
+    _validate(document)
+
+    values = {field: document[field] for field in TEXT_FIELDS}
+    values.update({field: json.dumps(document[field]) for field in LIST_FIELDS})
+    values["revision"] = expected_revision + 1
+    updated = db.query(Changelog).filter(
+        Changelog.id == changelog.id,
+        Changelog.revision == expected_revision
+    ).update(values, synchronize_session=False)
+    if not updated:
+        db.rollback()
+        db.refresh(changelog)
+        raise RevisionConflict(changelog.revision)
+    db.commit()
+    return document
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from contextlib import closing
+from datetime import datetime
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func
+
+from database import SessionLocal, Changelog
+
+# Rows fetched per round-trip while streaming; memory stays flat regardless of history size
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+SECTIONS = [
+    ("features", "Features"),
+    ("fixes", "Fixes"),
+    ("improvements", "Improvements"),
+    ("breaking", "Breaking Changes"),
+]
+
+
+def _load_list(value: Optional[str]) -> List[str]:
+    try:
+        return json.loads(value) if value else []
+    except ValueError:
+        return []
+
+
+def _filtered(query, project_id: str, repo_id: Optional[str]):
+    query = query.filter(Changelog.project_id == project_id)
+    if repo_id:
+        query = query.filter(Changelog.repo_id == repo_id)
+    return query
+
+
+def iter_changelogs(project_id: str, repo_id: Optional[str] = None) -> Iterator[Changelog]:
+    """Yield changelogs newest first through a server-side cursor.
+
+    The generator owns its session so it stays valid for the whole lifetime of a
+    streaming response, independently of the request-scoped session. Its cursor
+    and connection are only released when the generator finishes or is closed, so
+    callers that may stop early must call close() (export responses do so in a
+    background task, which also runs when the client disconnects).
+    """
+    db = SessionLocal()
+    try:
+        query = _filtered(db.query(Changelog), project_id, repo_id)
+        query = query.order_by(Changelog.generated_at.desc(), Changelog.id)
+        for changelog in query.execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE):
+            yield changelog
+    finally:
+        db.close()
+
+
+def export_etag(db, project_id: str, repo_id: Optional[str], export_format: str) -> str:
+    """Cheap validator for an export: changes whenever a changelog is added, removed, regenerated or edited."""
+    query = _filtered(
+        db.query(func.count(Changelog.id), func.max(Changelog.generated_at), func.sum(Changelog.revision)),
+        project_id, repo_id
+    )
+    count, latest, revisions = query.one()
+    key = f"{project_id}:{repo_id or ''}:{export_format}:{count}:{latest.isoformat() if latest else ''}:{revisions or 0}"
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def changelog_to_dict(changelog: Changelog) -> dict:
+    data = {
+        "id": changelog.id,
+        "repo_id": changelog.repo_id,
+        "project_id": changelog.project_id,
+        "version": changelog.version,
+        "title": changelog.title,
+        "description": changelog.description,
+        "generated_at": changelog.generated_at.isoformat(),
+        "pr_count": changelog.pr_count,
+        "revision": changelog.revision,
+    }
+    for field, _ in SECTIONS:
+        data[field] = _load_list(getattr(changelog, field))
+    return data
+
+
+def stream_markdown(project_id: str, repo_id: Optional[str] = None) -> Iterator[str]:
+    yield "# Changelog\n"
+    with closing(iter_changelogs(project_id, repo_id)) as changelogs:
+        for changelog in changelogs:
+            lines = [
+                "",
+                f"## {changelog.version} - {changelog.title} ({changelog.generated_at.strftime('%Y-%m-%d')})",
+                "",
+            ]
+            if changelog.description:
+                lines += [changelog.description, ""]
+            for field, heading in SECTIONS:
+                items = _load_list(getattr(changelog, field))
+                if items:
+                    lines += [f"### {heading}", ""] + [f"- {item}" for item in items] + [""]
+            yield "\n".join(lines)
+
+
+def stream_ndjson(project_id: str, repo_id: Optional[str] = None) -> Iterator[str]:
+    with closing(iter_changelogs(project_id, repo_id)) as changelogs:
+        for changelog in changelogs:
+            yield json.dumps(changelog_to_dict(changelog)) + "\n"
+
+
+def stream_atom(project_id: str, repo_id: Optional[str] = None, title: str = "ARIA Changelog") -> Iterator[str]:
+    feed_id = f"urn:aria:changelogs:{project_id}" + (f":{repo_id}" if repo_id else "")
+    header_written = False
+    with closing(iter_changelogs(project_id, repo_id)) as changelogs:
+        for changelog in changelogs:
+            if not header_written:
+                # Newest first, so the first row carries the feed's <updated>
+                yield _atom_header(feed_id, title, changelog.generated_at)
+                header_written = True
+            content = "".join(
+                f"<h3>{heading}</h3><ul>{''.join(f'<li>{escape(item)}</li>' for item in items)}</ul>"
+                for field, heading in SECTIONS
+                for items in [_load_list(getattr(changelog, field))]
+                if items
+            )
+            yield (
+                "  <entry>\n"
+                f"    <id>urn:uuid:{changelog.id}</id>\n"
+                f"    <title>{escape(f'{changelog.version} - {changelog.title}')}</title>\n"
+                f"    <updated>{changelog.generated_at.isoformat()}Z</updated>\n"
+                f"    <summary>{escape(changelog.description or '')}</summary>\n"
+                f"    <content type=\"html\">{escape(content)}</content>\n"
+                "  </entry>\n"
+            )
+    if not header_written:
+        yield _atom_header(feed_id, title, datetime.utcnow())
+    yield "</feed>\n"
+
+
+def _atom_header(feed_id: str, title: str, updated: datetime) -> str:
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        f"  <id>{escape(feed_id)}</id>\n"
+        f"  <title>{escape(title)}</title>\n"
+        f"  <updated>{updated.isoformat()}Z</updated>\n"
+    )
+
+
+# format -> (generator, media type, download filename)
+EXPORT_FORMATS = {
+    "markdown": (stream_markdown, "text/markdown; charset=utf-8", "CHANGELOG.md"),
+    "ndjson": (stream_ndjson, "application/x-ndjson", "changelogs.ndjson"),
+    "atom": (stream_atom, "application/atom+xml; charset=utf-8", "changelog.atom"),
+}
@@ -0,0 +1,113 @@
+import json
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from database import Changelog, Repository
+from github_service import github_service
+
+CONVENTIONAL_PREFIX = re.compile(r"^(\w+)(\([^)]*\))?(!)?:\s*")
+
+FEATURE_TYPES = {"feat", "feature"}
+FIX_TYPES = {"fix", "bugfix", "hotfix"}
+FEATURE_LABELS = {"feature", "enhancement"}
+FIX_LABELS = {"bug", "fix", "bugfix"}
+BREAKING_LABELS = {"breaking", "breaking change", "breaking-change"}
+
+
+def _categorize(title: str, body: str, labels: List[str]) -> Tuple[str, str]:
+    """Return (section, cleaned title) for a PR or commit using conventional prefixes and labels."""
+    labels = {label.lower() for label in labels}
+    match = CONVENTIONAL_PREFIX.match(title)
+    kind = match.group(1).lower() if match else ""
+    cleaned = title[match.end():] if match else title
+    cleaned = cleaned[:1].upper() + cleaned[1:]
+
+    if (match and match.group(3)) or "BREAKING CHANGE" in (body or "") or labels & BREAKING_LABELS:
+        return "breaking", cleaned
+    if kind in FEATURE_TYPES or labels & FEATURE_LABELS:
+        return "features", cleaned
+    if kind in FIX_TYPES or labels & FIX_LABELS:
+        return "fixes", cleaned
+    return "improvements", cleaned
+
+
+def generate_range_changelog(owner: str, name: str, token: str, base: Optional[str], head: Optional[str]) -> Dict:
+    """Build changelog sections for exactly the commits in base...head.
+
+    One compare call lists the commits and batched GraphQL queries resolve them to
+    pull requests, instead of paging through every closed PR of the repository.
+    When head is omitted the latest release tag is used.
+    """
+    if not base:
+        raise ValueError("No previous version recorded; pass an explicit base ref")
+    head_detected = not head
+    head = head or github_service.get_latest_release_tag(owner, name, token)
+    if not head:
+        raise ValueError("No release tag found; pass an explicit head ref")
+    if base == head:
+        raise ValueError(f"No new release since {base}")
+
+    commits = github_service.compare_commits(owner, name, base, head, token)
+    pull_requests = github_service.get_pull_requests_for_commits(owner, name, [c["sha"] for c in commits], token)
+
+    sections = {"features": [], "fixes": [], "improvements": [], "breaking": []}
+    seen_prs = set()
+    for commit in commits:
+        pr = pull_requests.get(commit["sha"])
+        if pr:
+            if pr["number"] in seen_prs:
+                continue
+            seen_prs.add(pr["number"])
+            labels = [label["name"] for label in (pr.get("labels") or {}).get("nodes", [])]
+            section, title = _categorize(pr["title"], pr.get("body") or "", labels)
+            sections[section].append(f"{title} (#{pr['number']})")
+        else:
+            message = commit["commit"]["message"]
+            subject = message.split("\n", 1)[0]
+            if subject.startswith("Merge "):
+                continue
+            section, title = _categorize(subject, message, [])
+            sections[section].append(f"{title} ({commit['sha'][:7]})")
+
+    return {
+        "base": base,
+        "head": head,
+        "head_detected": head_detected,
+        "commit_count": len(commits),
+        "pr_count": len(seen_prs),
+        "sections": sections,
+    }
+
+
+def save_range_changelog(db, repository: Repository, result: Dict) -> Changelog:
+    """Persist a range changelog and advance the repository to its head version when that is newer.
+
+    Only a range continuing from the stored version, or ending at the latest release,
+    moves the version forward; an explicit older range (say v1.0...v1.1 after v2.0)
+    leaves it alone so the poller doesn't regenerate releases that already have changelogs.
+    """
+    sections = result["sections"]
+    changelog = Changelog(
+        id=str(uuid.uuid4()),
+        repo_id=repository.id,
+        project_id=repository.project_id,
+        version=result["head"],
+        title=f"{repository.full_name} {result['head']}",
+        description=f"Changes from {result['base']} to {result['head']} ({result['commit_count']} commits)",
+        features=json.dumps(sections["features"]),
+        fixes=json.dumps(sections["fixes"]),
+        improvements=json.dumps(sections["improvements"]),
+        breaking=json.dumps(sections["breaking"]),
+        generated_at=datetime.utcnow(),
+        pr_count=result["pr_count"]
+    )
+    if (not repository.last_changelog_version or result["head_detected"]
+            or result["base"] == repository.last_changelog_version):
+        repository.last_changelog_version = result["head"]
+    repository.last_checked = datetime.utcnow()
+    db.add(changelog)
+    db.commit()
+    db.refresh(changelog)
+    return changelog
@@ -0,0 +1,193 @@
+import bisect
+import hashlib
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from database import PrimarySessionLocal, NodeHeartbeat, RepositoryLease
+
+HEARTBEAT_INTERVAL_SECONDS = int(os.getenv("HEARTBEAT_INTERVAL_SECONDS", "10"))
+NODE_TTL_SECONDS = int(os.getenv("NODE_TTL_SECONDS", str(HEARTBEAT_INTERVAL_SECONDS * 3)))
+VIRTUAL_NODES = int(os.getenv("CLUSTER_VIRTUAL_NODES", "64"))
+
+_node_id = None
+_node_pid = None
+
+
+def node_id() -> str:
+    """This process's node id; unique per process, so workers forked from a preloaded app differ."""
+    global _node_id, _node_pid
+    if _node_pid != os.getpid():
+        _node_pid = os.getpid()
+        _node_id = f"{os.getenv('NODE_ID') or socket.gethostname()}-{_node_pid}-{uuid.uuid4().hex[:6]}"
+    return _node_id
+
+
+def _hash(key: str) -> int:
+    return int(hashlib.md5(key.encode()).hexdigest()[:16], 16)
+
+
+class HashRing:
+    """Consistent hashing ring: a node joining or leaving only moves ~1/N of the keys."""
+
+    def __init__(self, nodes: List[str], replicas: int = VIRTUAL_NODES):
+        self.nodes = sorted(nodes)
+        self.ring = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self.points = [point for point, _ in self.ring]
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.ring:
+            return None
+        index = bisect.bisect(self.points, _hash(key)) % len(self.ring)
+        return self.ring[index][1]
+
+
+_ring = HashRing([])
+
+_heartbeat_thread = None
+_heartbeat_stop = threading.Event()
+
+
+def heartbeat():
+    """Renew this node's heartbeat, evict dead nodes and rebuild the ring from live members."""
+    global _ring
+    now = datetime.utcnow()
+    db = PrimarySessionLocal()
+    try:
+        node = db.query(NodeHeartbeat).filter(NodeHeartbeat.node_id == node_id()).first()
+        if node:
+            node.heartbeat_at = now
+        else:
+            db.add(NodeHeartbeat(node_id=node_id(), hostname=socket.gethostname(), started_at=now, heartbeat_at=now))
+        db.query(NodeHeartbeat).filter(
+            NodeHeartbeat.heartbeat_at < now - timedelta(seconds=NODE_TTL_SECONDS)
+        ).delete(synchronize_session=False)
+        db.commit()
+        live = [node_id for (node_id,) in db.query(NodeHeartbeat.node_id).all()]
+    finally:
+        db.close()
+
+    if sorted(live) != _ring.nodes:
+        print(f"🔁 Cluster membership changed: {len(live)} live nodes")
+        _ring = HashRing(live)
+
+
+def leave():
+    """Remove this node's heartbeat so peers rebalance immediately instead of waiting for the TTL."""
+    global _ring
+    _heartbeat_stop.set()
+    if _heartbeat_thread:
+        _heartbeat_thread.join(timeout=5)
+    db = PrimarySessionLocal()
+    try:
+        db.query(NodeHeartbeat).filter(NodeHeartbeat.node_id == node_id()).delete(synchronize_session=False)
+        db.query(RepositoryLease).filter(RepositoryLease.node_id == node_id()).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    _ring = HashRing([])
+
+
+def live_nodes() -> List[str]:
+    return list(_ring.nodes)
+
+
+def owns(key: str) -> bool:
+    return _ring.get(key) == node_id()
+
+
+def claim(db, repo_id: str, ttl_seconds: int) -> bool:
+    """Take the lease on a repository unless another node holds an unexpired one.
+
+    The ring decides who should work on a repository; the lease guarantees that two
+    nodes with momentarily different views of the membership never both do.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    updated = db.query(RepositoryLease).filter(
+        RepositoryLease.repo_id == repo_id,
+        (RepositoryLease.node_id == node_id()) | (RepositoryLease.expires_at < now)
+    ).update({"node_id": node_id(), "expires_at": expires_at}, synchronize_session=False)
+    if updated:
+        db.commit()
+        return True
+    if db.query(RepositoryLease.repo_id).filter(RepositoryLease.repo_id == repo_id).first():
+        db.rollback()
+        return False
+    try:
+        db.add(RepositoryLease(repo_id=repo_id, node_id=node_id(), expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        # Another node inserted the lease first
+        db.rollback()
+        return False
+
+
+def release(db, repo_id: str):
+    db.query(RepositoryLease).filter(
+        RepositoryLease.repo_id == repo_id,
+        RepositoryLease.node_id == node_id()
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def singleton(name: str, job: Callable) -> Callable:
+    """Wrap a scheduled job so exactly one live node (chosen by the ring) runs it."""
+    def run(*args, **kwargs):
+        if owns(f"job:{name}"):
+            return job(*args, **kwargs)
+    run.__name__ = f"singleton_{name}"
+    return run
+
+
+def _heartbeat_loop():
+    while not _heartbeat_stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+        try:
+            heartbeat()
+        except Exception as e:
+            print(f"❌ Heartbeat failed: {e}")
+
+
+def schedule_cluster():
+    """Join the cluster and keep renewing the heartbeat on a dedicated thread.
+
+    Heartbeats never share the scheduler thread: a slow job there would let this
+    node's heartbeat expire, so peers would evict it and rebalance while it keeps
+    working from its old ring.
+    """
+    global _heartbeat_thread
+    heartbeat()
+    if _heartbeat_thread and _heartbeat_thread.is_alive():
+        return
+    _heartbeat_stop.clear()
+    _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="aria-heartbeat", daemon=True)
+    _heartbeat_thread.start()
+
+
+if __name__ == "__main__":
+    # Run several of these against one DATABASE_URL to watch repositories rebalance as nodes come and go
+    from database import Repository
+    from migrations import migrate
+
+    migrate()
+    print(f"Node {node_id()}")
+    try:
+        while True:
+            heartbeat()
+            db = PrimarySessionLocal()
+            try:
+                repo_ids = [repo_id for (repo_id,) in db.query(Repository.id).all()]
+            finally:
+                db.close()
+            mine = [repo_id for repo_id in repo_ids if owns(repo_id)]
+            print(f"{len(live_nodes())} nodes, owning {len(mine)}/{len(repo_ids)} repositories")
+            time.sleep(HEARTBEAT_INTERVAL_SECONDS)
+    except KeyboardInterrupt:
+        leave()
@@ -0,0 +1,307 @@
+import os
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Bodies smaller than this are sent as-is; compressing them costs more CPU than it saves bytes
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+COMPRESSION_CACHE_MAX_ENTRY_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)))
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/atom+xml",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# Each encoding gets its own ETag, e.g. "abc" -> "abc-gzip", so caches never mix representations
+ETAG_SUFFIXES = {"br": "-br", "gzip": "-gzip"}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, preferring brotli."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _compressible(content_type: str) -> bool:
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    return etag[:-1] + ETAG_SUFFIXES[encoding] + '"'
+
+
+def cache_key(scope, etag: str, encoding: str) -> tuple:
+    return scope["method"], scope["path"], scope.get("query_string", b""), etag, encoding
+
+
+def _split_etag_suffix(etag: str) -> Tuple[str, Optional[str]]:
+    for suffix in ETAG_SUFFIXES.values():
+        if etag.endswith(suffix + '"'):
+            return etag[:-len(suffix) - 1] + '"', suffix
+    return etag, None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (method, path, query, ETag, encoding).
+
+    A strong ETag identifies the exact bytes of a representation, so a body cached
+    under it can be replayed without recompressing for as long as the app keeps
+    returning that ETag.
+    """
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+compressed_body_cache = CompressedBodyCache()
+
+
+def cached_compressed_response(request: Request, etag: str, media_type: str, headers: dict) -> Optional[Response]:
+    """Response replaying a compressed body cached under `etag`, or None on a miss.
+
+    For streamed endpoints: checked after the ETag is known and before the body
+    generator is built, so a hit skips both the database work and the compression.
+    On a miss the middleware compresses the stream and caches it for next time.
+    """
+    if not COMPRESSION_ENABLED:
+        return None
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if not encoding:
+        return None
+    body = compressed_body_cache.get(cache_key(request.scope, etag, encoding))
+    if body is None:
+        return None
+    # Content-Type set directly: Response would append a second charset to text/ types
+    headers = {**headers, "ETag": variant_etag(etag, encoding), "Content-Encoding": encoding, "Content-Type": media_type}
+    return Response(body, headers=headers)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with brotli or gzip, negotiated per request."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache: CompressedBodyCache = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else compressed_body_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""))
+        scope, client_suffix = self._strip_if_none_match(scope, headers)
+        responder = _CompressionResponder(self, scope, send, encoding, client_suffix)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def _strip_if_none_match(scope, headers: Headers):
+        """Map encoded-variant ETags back to the app's ETags so its 304 checks keep working."""
+        if_none_match = headers.get("if-none-match")
+        if not if_none_match:
+            return scope, None
+        tags, client_suffix = [], None
+        for tag in if_none_match.split(","):
+            tag, suffix = _split_etag_suffix(tag.strip())
+            tags.append(tag)
+            client_suffix = client_suffix or suffix
+        if client_suffix is None:
+            return scope, None
+        raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+        raw.append((b"if-none-match", ", ".join(tags).encode("latin-1")))
+        return dict(scope, headers=raw), client_suffix
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoding: Optional[str],
+                 client_suffix: Optional[str]):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.client_suffix = client_suffix
+        self.start_message = None
+        self.buffer = []
+        self.buffered = 0
+        self.mode = None  # None while buffering, then "identity" or "compress"
+        self.compressor = None
+        self.cache_key = None
+        self.cache_parts = []
+        self.cache_size = 0
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self._on_start(message)
+            if self.mode == "identity":
+                await self._send(self.start_message)
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode == "identity":
+            await self._send(message)
+        elif self.mode == "compress":
+            await self._send_compressed(body, more_body)
+        else:
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if more_body and self.buffered < self.middleware.minimum_size:
+                return
+            body, self.buffer = b"".join(self.buffer), []
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.mode = "identity"
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": body, "more_body": False})
+            else:
+                await self._begin_compression(body, more_body)
+
+    def _on_start(self, message):
+        self.start_message = message
+        headers = MutableHeaders(scope=message)
+        content_type = headers.get("content-type", "")
+        if _compressible(content_type):
+            headers.add_vary_header("Accept-Encoding")
+
+        if message["status"] == 304 and self.client_suffix and "etag" in headers:
+            # The client holds an encoded variant; confirm it with the ETag it sent
+            headers["etag"] = headers["etag"][:-1] + self.client_suffix + '"'
+        if (
+            self.encoding is None
+            or message["status"] < 200
+            or message["status"] in (204, 206, 304)
+            or "content-encoding" in headers
+            or not _compressible(content_type)
+        ):
+            self.mode = "identity"
+
+    async def _begin_compression(self, body: bytes, more_body: bool):
+        headers = MutableHeaders(scope=self.start_message)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/") and self.start_message["status"] == 200:
+            self.cache_key = cache_key(self.scope, etag, self.encoding)
+            headers["etag"] = variant_etag(etag, self.encoding)
+
+        headers["content-encoding"] = self.encoding
+        self.mode = "compress"
+        # Only a body the app has already produced in full is replaced from the cache. Finishing
+        # a streamed response early would abandon the app's generator mid-stream, so streaming
+        # endpoints look the cache up themselves (cached_compressed_response) before generating.
+        cached = self.middleware.cache.get(self.cache_key) if self.cache_key and not more_body else None
+        if cached is not None:
+            headers["content-length"] = str(len(cached))
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": cached, "more_body": False})
+            return
+
+        self.compressor = _Compressor(self.encoding)
+        if more_body:
+            # Streaming: the compressed length isn't known up front, so fall back to chunked encoding
+            del headers["content-length"]
+            await self._send(self.start_message)
+            await self._send_compressed(body, more_body)
+        else:
+            data = self.compressor.compress(body) + self.compressor.finish()
+            headers["content-length"] = str(len(data))
+            self._remember(data, more_body=False)
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": data, "more_body": False})
+
+    async def _send_compressed(self, body: bytes, more_body: bool):
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        self._remember(data, more_body)
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _remember(self, data: bytes, more_body: bool):
+        if self.cache_key is None:
+            return
+        self.cache_parts.append(data)
+        self.cache_size += len(data)
+        if self.cache_size > COMPRESSION_CACHE_MAX_ENTRY_BYTES:
+            self.cache_key, self.cache_parts = None, []
+        elif not more_body:
+            self.middleware.cache.put(self.cache_key, b"".join(self.cache_parts))
@@ -0,0 +1,9 @@
+"""Loads .env into the environment once, before any module reads its settings.
+
+Modules read their configuration from os.environ at import time, so this must be
+imported first by every entry point (main.py, serve.py) and by the modules that
+are also used standalone (database.py, auth.py).
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
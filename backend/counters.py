@@ -0,0 +1,155 @@
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Union
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from cluster import singleton
+from database import PrimarySessionLocal, engine, Counter, Changelog, Notification, Repository
+from scheduler import in_background, scheduler
+
+RECONCILE_INTERVAL_MINUTES = int(os.getenv("COUNTER_RECONCILE_INTERVAL_MINUTES", "60"))
+
+
+def project_repositories_key(project_id: str) -> str:
+    return f"project:{project_id}:repositories"
+
+
+def project_changelogs_key(project_id: str) -> str:
+    return f"project:{project_id}:changelogs"
+
+
+def repository_changelogs_key(repo_id: str) -> str:
+    return f"repository:{repo_id}:changelogs"
+
+
+def unread_notifications_key(user_id: str, project_id: str) -> str:
+    return f"notifications:{user_id}:{project_id}:unread"
+
+
+def counter_deltas(instances: Iterable, sign: int) -> Dict[str, int]:
+    """Counter changes implied by inserting (sign=1) or deleting (sign=-1) rows."""
+    deltas = defaultdict(int)
+    for instance in instances:
+        if isinstance(instance, Repository):
+            deltas[project_repositories_key(instance.project_id)] += sign
+        elif isinstance(instance, Changelog):
+            deltas[project_changelogs_key(instance.project_id)] += sign
+            deltas[repository_changelogs_key(instance.repo_id)] += sign
+        elif isinstance(instance, Notification) and not instance.read:
+            deltas[unread_notifications_key(instance.user_id, instance.project_id)] += sign
+    return deltas
+
+
+def _upsert(session: Session, key: str, value: int, increment: bool):
+    new_value = Counter.value + value if increment else value
+    if engine.dialect.name in ("sqlite", "postgresql"):
+        if engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        session.execute(insert(Counter).values(key=key, value=value).on_conflict_do_update(
+            index_elements=["key"], set_={"value": new_value}
+        ))
+    elif not session.execute(update(Counter).where(Counter.key == key).values(value=new_value)).rowcount:
+        session.execute(Counter.__table__.insert().values(key=key, value=value))
+
+
+def apply_deltas(session: Session, deltas: Dict[str, int]):
+    """Adjust counters inside the caller's transaction, so they commit or roll back with the rows."""
+    for key, delta in deltas.items():
+        if delta:
+            _upsert(session, key, delta, increment=True)
+
+
+def set_counter(session: Session, key: str, value: Union[int, ColumnElement]):
+    """Overwrite a counter; `value` may be a SQL expression evaluated by the same statement."""
+    _upsert(session, key, value, increment=False)
+
+
+def get_counters(session: Session, keys: List[str]) -> Dict[str, int]:
+    if not keys:
+        return {}
+    values = dict(session.query(Counter.key, Counter.value).filter(Counter.key.in_(keys)).all())
+    return {key: max(values.get(key, 0), 0) for key in keys}
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    deltas = defaultdict(int)
+    for source in (counter_deltas(session.new, 1), counter_deltas(session.deleted, -1)):
+        for key, delta in source.items():
+            deltas[key] += delta
+    for instance in session.dirty:
+        if isinstance(instance, Notification) and instance not in session.deleted:
+            history = inspect(instance).attrs.read.history
+            # Without a loaded old value there's no way to tell a transition from a repeat write
+            if history.has_changes() and history.deleted:
+                was_read = bool(history.deleted[0])
+                if was_read != bool(instance.read):
+                    deltas[unread_notifications_key(instance.user_id, instance.project_id)] += 1 if was_read else -1
+    apply_deltas(session, deltas)
+
+
+def _source_count(key: str):
+    """Scalar subquery counting the rows a counter key stands for."""
+    parts = key.split(":")
+    if parts[0] == "project" and parts[2] == "repositories":
+        query = select(func.count(Repository.id)).where(Repository.project_id == parts[1])
+    elif parts[0] == "project" and parts[2] == "changelogs":
+        query = select(func.count(Changelog.id)).where(Changelog.project_id == parts[1])
+    elif parts[0] == "repository" and parts[2] == "changelogs":
+        query = select(func.count(Changelog.id)).where(Changelog.repo_id == parts[1])
+    elif parts[0] == "notifications" and parts[3] == "unread":
+        query = select(func.count(Notification.id)).where(
+            Notification.user_id == parts[1], Notification.project_id == parts[2], Notification.read == False
+        )
+    else:
+        raise ValueError(f"Unknown counter key: {key}")
+    return query.scalar_subquery()
+
+
+def reconcile_counters() -> int:
+    """Recompute every counter from the source tables and repair any drift; returns counters fixed.
+
+    The GROUP BY pass only finds candidates. Each drifted key is then rewritten with a
+    single statement that counts and writes together, after locking the counter row
+    (Postgres), so an increment committed meanwhile is never overwritten.
+    """
+    db = PrimarySessionLocal()
+    try:
+        expected = defaultdict(int)
+        for project_id, count in db.query(Repository.project_id, func.count(Repository.id)).group_by(Repository.project_id):
+            expected[project_repositories_key(project_id)] = count
+        for project_id, count in db.query(Changelog.project_id, func.count(Changelog.id)).group_by(Changelog.project_id):
+            expected[project_changelogs_key(project_id)] = count
+        for repo_id, count in db.query(Changelog.repo_id, func.count(Changelog.id)).group_by(Changelog.repo_id):
+            expected[repository_changelogs_key(repo_id)] = count
+        for user_id, project_id, count in db.query(
+            Notification.user_id, Notification.project_id, func.count(Notification.id)
+        ).filter(Notification.read == False).group_by(Notification.user_id, Notification.project_id):
+            expected[unread_notifications_key(user_id, project_id)] = count
+
+        actual = dict(db.query(Counter.key, Counter.value).all())
+        db.rollback()
+        fixed = 0
+        for key in set(expected) | set(actual):
+            if expected.get(key, 0) != actual.get(key, 0):
+                db.query(Counter.key).filter(Counter.key == key).with_for_update().first()
+                set_counter(db, key, _source_count(key))
+                db.commit()
+                fixed += 1
+    finally:
+        db.close()
+
+    if fixed:
+        print(f"🔧 Reconciled {fixed} drifted counters")
+    return fixed
+
+
+def schedule_reconcile():
+    scheduler.every(RECONCILE_INTERVAL_MINUTES).minutes.do(
+        in_background("reconcile_counters", singleton("reconcile_counters", reconcile_counters))
+    )
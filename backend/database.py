@@ -1,22 +1,142 @@
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, String, Integer, DateTime, Boolean, Text, ForeignKey, event
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import Session, column_property, sessionmaker, relationship
+from sqlalchemy.sql import Select
 from datetime import datetime
 import os
-from dotenv import load_dotenv
+import random
+import time
 
-load_dotenv()
+import config  # noqa: F401  (loads .env before DATABASE_URL is read)
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./aria.db")
+# Comma-separated read replicas; reads fall back to the primary when unset
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# How long a user's reads stay on the primary after they write, to hide replication lag
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
 
-# Create engine with threading fix for SQLite
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# WAL lets readers (API reads, online backups) run alongside a writer instead of blocking it.
+# It needs shared memory, so set SQLITE_WAL=false when the database lives on a network filesystem
+# (NFS, SMB); WAL mode is stored in the file, so also run PRAGMA journal_mode=DELETE once to leave it.
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+
+def _create_engine(url):
+    # Create engine with threading fix for SQLite
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+        if SQLITE_WAL:
+            @event.listens_for(sqlite_engine, "connect")
+            def _enable_wal(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.close()
+        return sqlite_engine
+    return create_engine(url)
+
+engine = _create_engine(DATABASE_URL)
+replica_engines = [_create_engine(url) for url in DATABASE_REPLICA_URLS]
+
+# Shared store of recent writers, so stickiness holds whichever worker serves the next request
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+class RecentWrites:
+    """Process-local fallback: user_id -> monotonic time of their last committed write.
+
+    Only correct with a single worker; entries older than the window are pruned.
+    """
+    
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self._writes = {}
+    
+    def mark(self, user_id):
+        now = time.monotonic()
+        self._writes[user_id] = now
+        if len(self._writes) > 1024:
+            cutoff = now - self.window_seconds
+            for key, written_at in list(self._writes.items()):
+                if written_at < cutoff:
+                    self._writes.pop(key, None)
+    
+    def is_recent(self, user_id):
+        last_write = self._writes.get(user_id)
+        return last_write is not None and time.monotonic() - last_write < self.window_seconds
+
+
+class RedisRecentWrites:
+    """Marks recent writers in Redis with a TTL; visible to every worker and expires on its own."""
+    
+    def __init__(self, url, window_seconds):
+        import redis
+        self.redis = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.window_ms = int(window_seconds * 1000)
+    
+    def mark(self, user_id):
+        try:
+            self.redis.set(f"aria:recent-write:{user_id}", 1, px=self.window_ms)
+        except Exception as e:
+            print(f"⚠️  Could not record recent write in Redis: {e}")
+    
+    def is_recent(self, user_id):
+        try:
+            return bool(self.redis.exists(f"aria:recent-write:{user_id}"))
+        except Exception:
+            # Without the marker we can't rule out lag, so read from the primary
+            return True
+
+
+if replica_engines and REDIS_URL:
+    _recent_writes = RedisRecentWrites(REDIS_URL, READ_YOUR_WRITES_SECONDS)
 else:
-    engine = create_engine(DATABASE_URL)
+    if replica_engines:
+        print("⚠️  DATABASE_REPLICA_URLS set without REDIS_URL: read-your-writes only holds within one worker")
+    _recent_writes = RecentWrites(READ_YOUR_WRITES_SECONDS)
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to a replica and everything else to the primary.
+    
+    A session that has written stays on the primary, and so does any session
+    belonging to a user who wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kw):
+        if bind is not None:
+            # Explicit bind_arguments={"bind": engine} pins a single statement to the primary
+            return bind
+        if not replica_engines:
+            return engine
+        if self._flushing or not isinstance(clause, Select):
+            self.info["wrote"] = True
+            return engine
+        if self.info.get("wrote") or self._is_sticky():
+            return engine
+        # One replica per session so a request sees a single consistent snapshot
+        if "replica" not in self.info:
+            self.info["replica"] = random.choice(replica_engines)
+        return self.info["replica"]
+
+    def _is_sticky(self):
+        # Looked up once per session: one Redis round-trip per request at most
+        user_id = self.info.get("user_id")
+        if not user_id:
+            return False
+        if "sticky" not in self.info:
+            self.info["sticky"] = _recent_writes.is_recent(user_id)
+        return self.info["sticky"]
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    user_id = session.info.get("user_id")
+    if session.info.get("wrote") and user_id:
+        _recent_writes.mark(user_id)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Request-scoped sessions route reads to replicas
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+# Background jobs that read-modify-write (leases, retention, polling) always use the primary
+PrimarySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create base class
 Base = declarative_base()
@@ -92,6 +212,7 @@ class Changelog(Base):
     breaking = Column(Text)  # JSON string
     generated_at = Column(DateTime, default=datetime.utcnow)
     pr_count = Column(Integer, default=0)
+    revision = Column(Integer, default=1, server_default="1", nullable=False)  # Bumped on every edit
     
     # Relationships
     repository = relationship("Repository", back_populates="changelogs")
@@ -107,12 +228,62 @@ class Notification(Base):
     message = Column(Text)
     type = Column(String)  # success, error, info, warning
     timestamp = Column(DateTime, default=datetime.utcnow)
-    read = Column(Boolean, default=False)
+    # active_history loads the old value on assignment, so the unread counter sees real transitions
+    read = column_property(Column(Boolean, default=False), active_history=True)
     
     # Relationships
     user = relationship("User", back_populates="notifications")
     project = relationship("Project")
 
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(String, primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), index=True)
+    family_id = Column(String, index=True)  # All tokens descended from one login
+    token_hash = Column(String, unique=True, index=True)  # HMAC-SHA256, never the raw token
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime)
+    revoked_at = Column(DateTime, nullable=True)
+    replaced_by = Column(String, nullable=True)
+
+class Counter(Base):
+    __tablename__ = "counters"
+    
+    key = Column(String, primary_key=True)  # e.g. "project:<id>:changelogs"
+    value = Column(Integer, default=0, nullable=False)
+
+class RetentionPolicy(Base):
+    __tablename__ = "retention_policies"
+    
+    project_id = Column(String, ForeignKey("projects.id"), primary_key=True)
+    notification_days = Column(Integer, nullable=True)  # None = server default, 0 = keep forever
+    changelog_days = Column(Integer, nullable=True)  # None = server default, 0 = keep forever
+    archive = Column(Boolean, default=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class NodeHeartbeat(Base):
+    __tablename__ = "node_heartbeats"
+    
+    node_id = Column(String, primary_key=True)
+    hostname = Column(String)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class RepositoryLease(Base):
+    __tablename__ = "repository_leases"
+    
+    repo_id = Column(String, ForeignKey("repositories.id"), primary_key=True)
+    node_id = Column(String)
+    expires_at = Column(DateTime)
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+    
+    id = Column(Integer, primary_key=True)  # Single row
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
 # Database dependency
 def get_db():
     db = SessionLocal()
@@ -121,6 +292,40 @@ def get_db():
     finally:
         db.close()
 
+def get_primary_db():
+    # For reads that must not lag behind a write made moments ago by an anonymous caller
+    db = PrimarySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 # Create tables
-def create_tables():
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+def create_tables(bind=None):
+    # Pass a Connection to run inside its transaction (migrations hold a lock on it)
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+
+def _add_missing_columns(bind):
+    # create_all only creates missing tables; add columns introduced since a table was created
+    if isinstance(bind, Connection):
+        _add_columns(bind)
+    else:
+        with bind.begin() as conn:
+            _add_columns(conn)
+
+def _add_columns(conn):
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            conn.execute(text(ddl))
+            print(f"✅ Added column {table.name}.{column.name}") 
\ No newline at end of file
@@ -17,6 +17,10 @@ class EmailService:
         self.sender_email = os.getenv("SENDER_EMAIL", "")
         self.sender_password = os.getenv("SENDER_PASSWORD", "")
         self.enabled = bool(self.sender_email and self.sender_password)
+        self.smtp_timeout = float(os.getenv("SMTP_TIMEOUT", "10"))
+        # Reused authenticated connection; one sender at a time per process
+        self._server = None
+        self._lock = threading.Lock()
         
         if not self.enabled:
             print("⚠️  Email service not configured. Set SENDER_EMAIL and SENDER_PASSWORD environment variables.")
@@ -40,12 +44,12 @@ class EmailService:
                 html_part = MIMEText(html_body, "html")
                 message.attach(html_part)
             
-            # Create secure connection
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, to_email, message.as_string())
+            with self._lock:
+                try:
+                    self._get_server().sendmail(self.sender_email, to_email, message.as_string())
+                except Exception:
+                    self._server = None
+                    raise
             
             print(f"✅ Email sent successfully: {subject} to {to_email}")
             return True
@@ -54,6 +58,36 @@ class EmailService:
             print(f"❌ Failed to send email: {e}")
             return False
     
+    def _connect(self) -> smtplib.SMTP:
+        # Create secure connection
+        context = ssl.create_default_context()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+        server.starttls(context=context)
+        server.login(self.sender_email, self.sender_password)
+        return server
+    
+    def _get_server(self) -> smtplib.SMTP:
+        # Reuse the open connection while the server still answers NOOP, otherwise reconnect
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+        self._server = self._connect()
+        return self._server
+    
+    def warm_up(self):
+        """Connect and authenticate ahead of the first send (TLS + AUTH dominate send latency)."""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                self._get_server()
+        except Exception as e:
+            print(f"⚠️  SMTP warm-up failed: {e}")
+    
     def send_changelog_notification(self, to_email: str, repo_name: str, version: str, changes: List[str], pr_count: int) -> bool:
         subject = f"🚀 New Changelog Generated: {version} for {repo_name}"
         
@@ -0,0 +1,150 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Commits resolved to pull requests per GraphQL query
+GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "50"))
+
+GITHUB_URL_PATTERN = re.compile(r"^(?:https?://)?(?:www\.)?github\.com/([^/\s]+)/([^/\s]+?)(?:\.git)?/?$")
+
+
+def parse_repo_url(repo_url: str) -> Optional[Tuple[str, str]]:
+    """Return (owner, name) for a GitHub repository URL, or None if it isn't one."""
+    match = GITHUB_URL_PATTERN.match(repo_url.strip())
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
+class _AuthorizedSession:
+    """Per-token view over the shared connection pool."""
+
+    def __init__(self, http: requests.Session, token: str):
+        self.http = http
+        self.headers = {"Authorization": f"token {token}"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.http.get(url, headers=self.headers, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.http.post(url, headers=self.headers, **kwargs)
+
+
+class GitHubService:
+    def __init__(self):
+        self.api_url = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+        self.timeout = float(os.getenv("GITHUB_TIMEOUT", "10"))
+        self.max_workers = int(os.getenv("GITHUB_MAX_WORKERS", "8"))
+        # One pooled session for the process so requests reuse warm TLS connections
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.http.headers.update({"Accept": "application/vnd.github+json"})
+
+    def _session(self, token: str) -> _AuthorizedSession:
+        return _AuthorizedSession(self.http, token)
+
+    def warm_up(self):
+        """Open a connection to the API ahead of the first request."""
+        try:
+            self.http.head(self.api_url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"⚠️  GitHub API warm-up failed: {e}")
+
+    def _get_repository(self, session: requests.Session, full_name: str) -> Optional[Dict]:
+        try:
+            response = session.get(f"{self.api_url}/repos/{full_name}", timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"❌ GitHub lookup failed for {full_name}: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def get_repository(self, owner: str, name: str, token: str) -> Optional[Dict]:
+        with self._session(token) as session:
+            return self._get_repository(session, f"{owner}/{name}")
+
+    def get_repositories(self, full_names: List[str], token: str) -> Dict[str, Optional[Dict]]:
+        """Look up many repositories concurrently; missing or inaccessible ones map to None."""
+        if not full_names:
+            return {}
+        with self._session(token) as session:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(full_names))) as executor:
+                results = executor.map(lambda full_name: self._get_repository(session, full_name), full_names)
+                return dict(zip(full_names, results))
+
+    def list_org_repositories(self, org: str, token: str) -> List[Dict]:
+        repos = []
+        url = f"{self.api_url}/orgs/{org}/repos?per_page=100&type=all"
+        with self._session(token) as session:
+            while url:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code != 200:
+                    raise ValueError(f"Could not list repositories for {org}: HTTP {response.status_code}")
+                repos.extend(response.json())
+                url = response.links.get("next", {}).get("url")
+        return repos
+
+    def get_latest_release_tag(self, owner: str, name: str, token: str) -> Optional[str]:
+        """Tag of the latest published release, falling back to the most recent tag."""
+        with self._session(token) as session:
+            response = session.get(f"{self.api_url}/repos/{owner}/{name}/releases/latest", timeout=self.timeout)
+            if response.status_code == 200:
+                return response.json().get("tag_name")
+            response = session.get(f"{self.api_url}/repos/{owner}/{name}/tags?per_page=1", timeout=self.timeout)
+            if response.status_code == 200 and response.json():
+                return response.json()[0]["name"]
+        return None
+
+    def compare_commits(self, owner: str, name: str, base: str, head: str, token: str) -> List[Dict]:
+        """Every commit reachable from head but not base, via the compare API (paged only past 100 commits)."""
+        commits = []
+        url = f"{self.api_url}/repos/{owner}/{name}/compare/{base}...{head}?per_page=100"
+        with self._session(token) as session:
+            while url:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code != 200:
+                    raise ValueError(f"Could not compare {base}...{head}: HTTP {response.status_code}")
+                commits.extend(response.json().get("commits", []))
+                url = response.links.get("next", {}).get("url")
+        return commits
+
+    def get_pull_requests_for_commits(self, owner: str, name: str, shas: List[str], token: str) -> Dict[str, Dict]:
+        """Map commit SHAs to their merged pull request with one GraphQL query per batch of commits."""
+        pull_requests = {}
+        with self._session(token) as session:
+            for start in range(0, len(shas), GRAPHQL_BATCH_SIZE):
+                batch = shas[start:start + GRAPHQL_BATCH_SIZE]
+                fields = "\n".join(
+                    f'c{i}: object(oid: "{sha}") {{ ... on Commit {{ associatedPullRequests(first: 5) {{ nodes {{ '
+                    f'number title body url mergedAt labels(first: 10) {{ nodes {{ name }} }} }} }} }} }}'
+                    for i, sha in enumerate(batch)
+                )
+                query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+                response = session.post(f"{self.api_url}/graphql", timeout=self.timeout,
+                                        json={"query": query, "variables": {"owner": owner, "name": name}})
+                if response.status_code != 200:
+                    raise ValueError(f"GraphQL lookup failed: HTTP {response.status_code}")
+                repository = (response.json().get("data") or {}).get("repository") or {}
+                for i, sha in enumerate(batch):
+                    nodes = ((repository.get(f"c{i}") or {}).get("associatedPullRequests") or {}).get("nodes") or []
+                    merged = [node for node in nodes if node.get("mergedAt")]
+                    if merged:
+                        pull_requests[sha] = merged[0]
+        return pull_requests
+
+
+# Global GitHub service instance
+github_service = GitHubService()
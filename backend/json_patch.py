@@ -0,0 +1,114 @@
+import copy
+from typing import Any, Dict, List, Tuple
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"JSON pointer must be a string: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _array_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    # isdigit() alone accepts non-ASCII digits such as "²", which int() rejects
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve_parent(document: Any, pointer: str) -> Tuple[Any, str]:
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Operations on the document root are not supported")
+    target = document
+    for token in tokens[:-1]:
+        target = _get_child(target, token)
+    return target, tokens[-1]
+
+
+def _get_child(container: Any, token: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Path not found: {token}")
+        return container[token]
+    if isinstance(container, list):
+        return container[_array_index(container, token, allow_end=False)]
+    raise JsonPatchError(f"Cannot traverse into {type(container).__name__}")
+
+
+def _get(document: Any, pointer: str) -> Any:
+    target = document
+    for token in _parse_pointer(pointer):
+        target = _get_child(target, token)
+    return target
+
+
+def _add(document: Any, pointer: str, value: Any):
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to {type(parent).__name__}")
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, token, allow_end=False))
+    raise JsonPatchError(f"Cannot remove from {type(parent).__name__}")
+
+
+def apply_patch(document: Dict, operations: List[Dict]) -> Dict:
+    """Apply RFC 6902 operations to a copy of `document`; all operations succeed or none do."""
+    if not isinstance(operations, list):
+        raise JsonPatchError("Patch must be a list of operations")
+    result = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise JsonPatchError(f"Malformed operation: {operation}")
+        op, path = operation["op"], operation["path"]
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"'{op}' requires a value")
+        if op in ("move", "copy") and not isinstance(operation.get("from"), str):
+            raise JsonPatchError(f"'{op}' requires a from path")
+        if not isinstance(path, str):
+            raise JsonPatchError(f"Path must be a string: {path!r}")
+
+        if op == "add":
+            _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(result, path)
+        elif op == "replace":
+            _remove(result, path)
+            _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            if path.startswith(operation["from"] + "/"):
+                raise JsonPatchError("Cannot move a value into one of its children")
+            _add(result, path, _remove(result, operation["from"]))
+        elif op == "copy":
+            _add(result, path, copy.deepcopy(_get(result, operation["from"])))
+        elif op == "test":
+            if _get(result, path) != operation["value"]:
+                raise JsonPatchError(f"Test failed at {path}")
+        else:
+            raise JsonPatchError(f"Unsupported operation: {op}")
+    return result
@@ -1,7 +1,10 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, status
+# Loads .env before any of the modules below read their settings
+import config  # noqa: F401
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Header, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
+from starlette.background import BackgroundTask
 from typing import List, Optional, Dict, Any
 import asyncio
 import json
@@ -10,18 +13,65 @@ import requests
 import time
 import threading
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 # Import our modules
-from database import get_db, create_tables, User, Project, Repository, Changelog, Notification
-from auth import get_current_user, authenticate_user, create_user, create_access_token, update_last_login
+from database import get_db, get_primary_db, engine, User, Project, Repository, Changelog, Notification, RetentionPolicy
+from auth import get_current_user, authenticate_user, create_user, create_access_token, update_last_login, \
+    create_refresh_token, rotate_refresh_token, revoke_refresh_token
 from email_service import email_service
+from github_service import github_service, parse_repo_url
+from changelog_export import EXPORT_FORMATS, changelog_to_dict, export_etag, stream_atom
+from retention import get_retention_policy, schedule_retention
+from migrations import check_schema, migrate
+from scheduler import start_scheduler, stop_scheduler
+from cluster import leave, node_id, schedule_cluster
+from poller import schedule_polling
+from backup import schedule_backups
+from rate_limit import RateLimitMiddleware
+from compression import CompressionMiddleware, cached_compressed_response
+from changelog_generator import generate_range_changelog, save_range_changelog
+from changelog_editor import RevisionConflict, patch_changelog
+from json_patch import JsonPatchError
+from counters import apply_deltas, get_counters, schedule_reconcile, project_repositories_key, \
+    project_changelogs_key, repository_changelogs_key, unread_notifications_key
 
-load_dotenv()
+# Startup and shutdown for each worker process
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.monotonic()
+    # Under serve.py the master migrates once before forking and sets AUTO_MIGRATE=false for workers
+    if os.getenv("AUTO_MIGRATE", "true").lower() == "true":
+        migrate()
+    else:
+        check_schema()
+    # Pay connection setup (DB, GitHub TLS, SMTP auth) before the first request instead of during it
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    github_service.warm_up()
+    email_service.warm_up()
+    schedule_cluster()
+    schedule_retention()
+    schedule_polling()
+    schedule_reconcile()
+    schedule_backups()
+    start_scheduler()
+    print(f"✅ Worker {os.getpid()} ready in {time.monotonic() - started:.2f}s")
+    yield
+    stop_scheduler()
+    leave()
 
-app = FastAPI(title="ARIA API", version="2.0.0")
+
+app = FastAPI(title="ARIA API", version="2.0.0", lifespan=lifespan)
+
+# Upper bound on repositories accepted by a single bulk connect request
+MAX_BULK_CONNECT = int(os.getenv("MAX_BULK_CONNECT", "500"))
+
+# Rate limiting (registered first so CORS headers are still added to 429 responses)
+app.add_middleware(RateLimitMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -32,11 +82,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables on startup
-@app.on_event("startup")
-async def startup_event():
-    create_tables()
-    print("✅ Database tables created")
+# Compression (added last so it wraps CORS and rate limiting and sees their final headers)
+app.add_middleware(CompressionMiddleware)
 
 # Health check
 @app.get("/health")
@@ -45,6 +92,7 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "version": "2.0.0",
+        "node": node_id(),
         "features": ["authentication", "database", "auto-generation", "email"]
     }
 
@@ -63,8 +111,9 @@ async def register(request: Dict, db: Session = Depends(get_db)):
         if not user:
             raise HTTPException(status_code=400, detail="User already exists")
         
-        # Create access token
+        # Create access and refresh tokens
         access_token = create_access_token(data={"sub": user.id})
+        refresh_token, _ = create_refresh_token(db, user.id)
         
         return {
             "success": True,
@@ -74,7 +123,8 @@ async def register(request: Dict, db: Session = Depends(get_db)):
                 "name": user.name,
                 "created_at": user.created_at.isoformat()
             },
-            "token": access_token
+            "token": access_token,
+            "refresh_token": refresh_token
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -92,11 +142,15 @@ async def login(request: Dict, db: Session = Depends(get_db)):
         if not user:
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
+        # Keeps the user's next reads on the primary once the login writes below commit
+        db.info["user_id"] = user.id
+        
         # Update last login
         update_last_login(db, user.id)
         
-        # Create access token
+        # Create access and refresh tokens
         access_token = create_access_token(data={"sub": user.id})
+        refresh_token, _ = create_refresh_token(db, user.id)
         
         return {
             "success": True,
@@ -107,11 +161,40 @@ async def login(request: Dict, db: Session = Depends(get_db)):
                 "created_at": user.created_at.isoformat(),
                 "last_login": user.last_login.isoformat()
             },
-            "token": access_token
+            "token": access_token,
+            "refresh_token": refresh_token
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/auth/refresh")
+async def refresh(request: Dict, db: Session = Depends(get_primary_db)):
+    refresh_token = request.get("refresh_token")
+    if not refresh_token:
+        raise HTTPException(status_code=400, detail="Missing refresh token")
+    
+    # No password check here: rotating an HMAC-hashed token skips bcrypt entirely.
+    # Lookup and reuse detection read the primary: the token may be only milliseconds old.
+    rotated = rotate_refresh_token(db, refresh_token)
+    if not rotated:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    user_id, new_refresh_token = rotated
+    
+    return {
+        "success": True,
+        "token": create_access_token(data={"sub": user_id}),
+        "refresh_token": new_refresh_token
+    }
+
+@app.post("/auth/logout")
+async def logout(request: Dict, db: Session = Depends(get_primary_db)):
+    refresh_token = request.get("refresh_token")
+    if not refresh_token:
+        raise HTTPException(status_code=400, detail="Missing refresh token")
+    
+    revoke_refresh_token(db, refresh_token)
+    return {"success": True}
+
 @app.get("/auth/verify")
 async def verify_token(current_user: User = Depends(get_current_user)):
     return {
@@ -176,6 +259,17 @@ async def get_projects(
     try:
         projects = db.query(Project).filter(Project.user_id == current_user.id).all()
         
+        # Counts come from maintained counters: one primary-key lookup each, no row scans
+        counts = get_counters(db, [
+            key
+            for project in projects
+            for key in (
+                project_repositories_key(project.id),
+                project_changelogs_key(project.id),
+                unread_notifications_key(current_user.id, project.id)
+            )
+        ])
+        
         return {
             "success": True,
             "projects": [
@@ -186,7 +280,10 @@ async def get_projects(
                     "created_at": project.created_at.isoformat(),
                     "updated_at": project.updated_at.isoformat(),
                     "auto_generation": project.auto_generation,
-                    "email_notifications": project.email_notifications
+                    "email_notifications": project.email_notifications,
+                    "repository_count": counts[project_repositories_key(project.id)],
+                    "changelog_count": counts[project_changelogs_key(project.id)],
+                    "unread_notifications": counts[unread_notifications_key(current_user.id, project.id)]
                 }
                 for project in projects
             ]
@@ -194,6 +291,57 @@ async def get_projects(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/projects/{project_id}/retention")
+async def get_project_retention(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    return {"success": True, "retention": get_retention_policy(db, project_id)}
+
+@app.put("/projects/{project_id}/retention")
+async def update_project_retention(
+    project_id: str,
+    request: Dict,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    policy = db.query(RetentionPolicy).filter(RetentionPolicy.project_id == project_id).first()
+    if not policy:
+        policy = RetentionPolicy(project_id=project_id)
+        db.add(policy)
+    
+    for field in ("notification_days", "changelog_days"):
+        if field in request:
+            value = request[field]
+            # bool is a subclass of int, so true/false would otherwise pass as 1/0 days
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+                raise HTTPException(status_code=400, detail=f"{field} must be a non-negative integer or null")
+            setattr(policy, field, value)
+    if "archive" in request:
+        policy.archive = bool(request["archive"])
+    policy.updated_at = datetime.utcnow()
+    
+    db.commit()
+    
+    return {"success": True, "retention": get_retention_policy(db, project_id)}
+
 # Repository management endpoints
 @app.post("/repositories/connect")
 async def connect_repository(
@@ -210,13 +358,12 @@ async def connect_repository(
             raise HTTPException(status_code=400, detail="Missing required fields")
         
         # Parse repository URL
-        if "github.com" in repo_url:
-            parts = repo_url.replace("https://github.com/", "").replace(".git", "").split("/")
-            if len(parts) != 2:
-                raise HTTPException(status_code=400, detail="Invalid GitHub URL")
-            owner, name = parts
-        else:
+        if "github.com" not in repo_url:
             raise HTTPException(status_code=400, detail="Only GitHub repositories are supported")
+        parsed = parse_repo_url(repo_url)
+        if not parsed:
+            raise HTTPException(status_code=400, detail="Invalid GitHub URL")
+        owner, name = parsed
         
         # Check if repository already exists
         existing_repo = db.query(Repository).filter(
@@ -259,6 +406,139 @@ async def connect_repository(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/repositories/connect/bulk")
+async def connect_repositories_bulk(
+    request: Dict,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        project_id = request.get("project_id")
+        github_token = request.get("github_token")
+        repo_urls = request.get("repo_urls") or []
+        org = request.get("org")
+        
+        if not all([project_id, github_token]) or not (repo_urls or org):
+            raise HTTPException(status_code=400, detail="Missing required fields")
+        if not isinstance(repo_urls, list):
+            raise HTTPException(status_code=400, detail="repo_urls must be a list")
+        
+        # Verify project belongs to user
+        project = db.query(Project).filter(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        ).first()
+        
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        results = []
+        # GitHub names are case-insensitive, so candidates are keyed by the lowercased full name
+        candidates = {}  # lowercased full_name -> (owner, name, GitHub metadata or None)
+        
+        if org:
+            # Enumerated repos are already validated by the listing itself
+            try:
+                org_repos = await asyncio.to_thread(github_service.list_org_repositories, org, github_token)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            for repo in org_repos:
+                candidates[repo["full_name"].lower()] = (repo["owner"]["login"], repo["name"], repo)
+        
+        for repo_url in repo_urls:
+            parsed = parse_repo_url(repo_url) if isinstance(repo_url, str) else None
+            if not parsed:
+                results.append({"repo_url": repo_url, "success": False, "error": "Invalid GitHub URL"})
+                continue
+            owner, name = parsed
+            candidates.setdefault(f"{owner}/{name}".lower(), (owner, name, None))
+        
+        if len(candidates) > MAX_BULK_CONNECT:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_CONNECT} repositories per request")
+        
+        def connected(keys):
+            # One set-based query for everything already connected to this project
+            if not keys:
+                return set()
+            return {
+                full_name.lower() for (full_name,) in db.query(Repository.full_name).filter(
+                    Repository.project_id == project_id,
+                    func.lower(Repository.full_name).in_(list(keys))
+                )
+            }
+        
+        existing = connected(candidates)
+        
+        # Validate the remaining URLs against GitHub concurrently
+        to_validate = [f"{owner}/{name}" for key, (owner, name, meta) in candidates.items()
+                       if meta is None and key not in existing]
+        validated = await asyncio.to_thread(github_service.get_repositories, to_validate, github_token)
+        
+        resolved = []  # (requested full_name, GitHub metadata)
+        for key, (owner, name, meta) in candidates.items():
+            requested = f"{owner}/{name}"
+            if key in existing:
+                results.append({"full_name": requested, "success": False, "error": "Repository already connected"})
+                continue
+            meta = meta or validated.get(requested)
+            if not meta:
+                results.append({"full_name": requested, "success": False, "error": "Repository not found or not accessible"})
+                continue
+            resolved.append((requested, meta))
+        
+        # GitHub returns the canonical name, which can differ from the URL (case, renamed repos)
+        existing = connected({meta["full_name"].lower() for _, meta in resolved})
+        
+        repositories = []
+        now = datetime.utcnow()
+        for requested, meta in resolved:
+            full_name = meta["full_name"]
+            if full_name.lower() in existing:
+                results.append({"full_name": full_name, "success": False, "error": "Repository already connected"})
+                continue
+            existing.add(full_name.lower())
+            owner, name = meta["owner"]["login"], meta["name"]
+            repository = Repository(
+                id=str(uuid.uuid4()),
+                owner=owner,
+                name=name,
+                full_name=full_name,
+                description=meta.get("description"),
+                project_id=project_id,
+                github_token=github_token,
+                last_checked=now,
+                auto_gen_enabled=True
+            )
+            repositories.append(repository)
+            results.append({
+                "full_name": full_name,
+                "success": True,
+                "repository": {
+                    "id": repository.id,
+                    "owner": owner,
+                    "name": name,
+                    "full_name": full_name,
+                    "project_id": project_id
+                }
+            })
+        
+        # Single transaction for the whole batch
+        db.add_all(repositories)
+        db.commit()
+        
+        print(f"Connected {len(repositories)} repositories to project {project_id}")
+        
+        return {
+            "success": True,
+            "connected": len(repositories),
+            "failed": len(results) - len(repositories),
+            "results": results
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/repositories/{project_id}")
 async def get_repositories(
     project_id: str,
@@ -276,6 +556,7 @@ async def get_repositories(
             raise HTTPException(status_code=404, detail="Project not found")
         
         repositories = db.query(Repository).filter(Repository.project_id == project_id).all()
+        counts = get_counters(db, [repository_changelogs_key(repo.id) for repo in repositories])
         
         return {
             "success": True,
@@ -287,7 +568,8 @@ async def get_repositories(
                     "full_name": repo.full_name,
                     "description": repo.description,
                     "last_checked": repo.last_checked.isoformat(),
-                    "auto_gen_enabled": repo.auto_gen_enabled
+                    "auto_gen_enabled": repo.auto_gen_enabled,
+                    "changelog_count": counts[repository_changelogs_key(repo.id)]
                 }
                 for repo in repositories
             ]
@@ -357,6 +639,76 @@ async def generate_changelog(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/changelogs/generate/range")
+async def generate_range_changelog_endpoint(
+    project_id: str,
+    repo_id: str,
+    base: Optional[str] = None,
+    head: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        # Verify project belongs to user
+        project = db.query(Project).filter(
+            Project.id == project_id,
+            Project.user_id == current_user.id
+        ).first()
+        
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        # Get repository
+        repository = db.query(Repository).filter(
+            Repository.id == repo_id,
+            Repository.project_id == project_id
+        ).first()
+        
+        if not repository:
+            raise HTTPException(status_code=404, detail="Repository not found")
+        
+        # Default to everything since the last generated version up to the newest release
+        try:
+            result = await asyncio.to_thread(
+                generate_range_changelog,
+                repository.owner,
+                repository.name,
+                repository.github_token,
+                base or repository.last_changelog_version,
+                head
+            )
+        except requests.RequestException as e:
+            # Checked before ValueError: requests' JSONDecodeError subclasses both
+            print(f"❌ GitHub request failed for {repository.full_name}: {e}")
+            raise HTTPException(status_code=502, detail="GitHub is unavailable, try again later")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        changelog = save_range_changelog(db, repository, result)
+        sections = result["sections"]
+        
+        return {
+            "success": True,
+            "changelog": {
+                "id": changelog.id,
+                "version": changelog.version,
+                "title": changelog.title,
+                "description": changelog.description,
+                "base": result["base"],
+                "head": result["head"],
+                "features": sections["features"],
+                "fixes": sections["fixes"],
+                "improvements": sections["improvements"],
+                "breaking": sections["breaking"],
+                "generated_at": changelog.generated_at.isoformat(),
+                "pr_count": changelog.pr_count
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/changelogs/{project_id}")
 async def get_changelogs(
     project_id: str,
@@ -384,7 +736,8 @@ async def get_changelogs(
                     "title": changelog.title,
                     "description": changelog.description,
                     "generated_at": changelog.generated_at.isoformat(),
-                    "pr_count": changelog.pr_count
+                    "pr_count": changelog.pr_count,
+                    "revision": changelog.revision
                 }
                 for changelog in changelogs
             ]
@@ -392,6 +745,117 @@ async def get_changelogs(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/changelogs/{project_id}/export")
+async def export_changelogs(
+    request: Request,
+    project_id: str,
+    format: str = "markdown",
+    repo_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    
+    # Verify project belongs to user
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    etag = export_etag(db, project_id, repo_id, format)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    generator, media_type, filename = EXPORT_FORMATS[format]
+    headers["Content-Disposition"] = f'inline; filename="{filename}"'
+    
+    # A repeat download of an unchanged export replays the compressed bytes without querying again
+    cached = cached_compressed_response(request, etag, media_type, headers)
+    if cached:
+        return cached
+    
+    if generator is stream_atom:
+        body = stream_atom(project_id, repo_id, title=f"{project.name} changelog")
+    else:
+        body = generator(project_id, repo_id)
+    
+    # Runs after the stream ends or the client disconnects, so the export's session never waits for GC
+    return StreamingResponse(body, media_type=media_type, headers=headers, background=BackgroundTask(body.close))
+
+@app.get("/changelogs/{project_id}/versions/{version}")
+async def get_changelog_version(
+    project_id: str,
+    version: str,
+    repo_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Verify project belongs to user
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    query = db.query(Changelog).filter(Changelog.project_id == project_id, Changelog.version == version)
+    if repo_id:
+        query = query.filter(Changelog.repo_id == repo_id)
+    changelog = query.order_by(Changelog.generated_at.desc()).first()
+    
+    if not changelog:
+        raise HTTPException(status_code=404, detail="Changelog version not found")
+    
+    # A published version only changes through PATCH, which bumps its revision
+    etag = f'"{changelog.id}.{changelog.revision}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse({"success": True, "changelog": changelog_to_dict(changelog)}, headers=headers)
+
+@app.patch("/changelogs/{changelog_id}")
+async def edit_changelog(
+    changelog_id: str,
+    request: Dict,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    revision = request.get("revision")
+    operations = request.get("patch")
+    
+    if not isinstance(revision, int) or operations is None:
+        raise HTTPException(status_code=400, detail="Missing revision or patch")
+    
+    # Verify changelog belongs to one of the user's projects
+    changelog = db.query(Changelog).join(Project, Changelog.project_id == Project.id).filter(
+        Changelog.id == changelog_id,
+        Project.user_id == current_user.id
+    ).first()
+    
+    if not changelog:
+        raise HTTPException(status_code=404, detail="Changelog not found")
+    
+    try:
+        document = patch_changelog(db, changelog, revision, operations)
+    except RevisionConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "revision": e.current_revision})
+    except JsonPatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return {
+        "success": True,
+        "changelog": {"id": changelog_id, "revision": revision + 1, **document}
+    }
+
 # Notification endpoints
 @app.get("/notifications/{project_id}")
 async def get_notifications(
@@ -431,6 +895,53 @@ async def get_notifications(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/notifications/{project_id}/unread-count")
+async def get_unread_count(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    key = unread_notifications_key(current_user.id, project_id)
+    return {"success": True, "unread": get_counters(db, [key])[key]}
+
+@app.post("/notifications/{project_id}/read-all")
+async def mark_all_notifications_read(
+    project_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # One set-based UPDATE; the counter drops by the rows it changed, in the same transaction
+    # (setting it to 0 would discard a notification added concurrently)
+    updated = db.query(Notification).filter(
+        Notification.project_id == project_id,
+        Notification.user_id == current_user.id,
+        Notification.read == False
+    ).update({"read": True}, synchronize_session=False)
+    apply_deltas(db, {unread_notifications_key(current_user.id, project_id): -updated})
+    db.commit()
+    
+    return {"success": True, "updated": updated}
+
+@app.post("/notifications/{notification_id}/read")
+async def mark_notification_read(
+    notification_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    notification = db.query(Notification).filter(
+        Notification.id == notification_id,
+        Notification.user_id == current_user.id
+    ).first()
+    
+    if not notification:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    
+    # The flush hook decrements the unread counter when the flag flips
+    notification.read = True
+    db.commit()
+    
+    return {"success": True}
+
 # Email endpoints
 @app.get("/email/status")
 async def get_email_status():
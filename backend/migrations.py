@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from database import engine, create_tables, SchemaVersion
+
+# Bump when the models change, and add a step to MIGRATIONS if create_tables can't handle it alone
+SCHEMA_VERSION = 1
+
+# version -> callable(connection) bringing the schema from version - 1 to version
+MIGRATIONS = {
+    # Baseline: every table and additive column the models define
+    1: create_tables,
+}
+
+# Arbitrary constant identifying the migration lock among Postgres advisory locks
+MIGRATION_LOCK_ID = 7_310_523
+# How long a worker waits for another one's migration before giving up (SQLite)
+MIGRATION_LOCK_TIMEOUT_MS = 60_000
+
+
+@contextmanager
+def _migration_lock():
+    """A connection holding the database-wide migration lock for one transaction.
+
+    Workers started together (uvicorn --workers N) all run migrate(); the lock makes
+    them take turns, so only the first applies DDL and the rest find it done.
+    """
+    if engine.dialect.name == "sqlite":
+        # pysqlite starts transactions lazily (and never as IMMEDIATE), so switch its
+        # implicit handling off on this connection and issue the BEGIN ourselves
+        conn = engine.connect()
+        dbapi_connection = conn.connection.dbapi_connection
+        isolation_level = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+        try:
+            with conn.begin():
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {MIGRATION_LOCK_TIMEOUT_MS}")
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                yield conn
+        finally:
+            dbapi_connection.isolation_level = isolation_level
+            conn.close()
+    else:
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            yield conn
+
+
+def _read_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return 0
+    version = conn.execute(
+        SchemaVersion.__table__.select().with_only_columns([SchemaVersion.version]).where(SchemaVersion.id == 1)
+    ).scalar()
+    return version or 0
+
+
+def _write_version(conn: Connection, version: int):
+    table = SchemaVersion.__table__
+    values = {"version": version, "applied_at": datetime.utcnow()}
+    # Safe as update-then-insert: the migration lock is held
+    if not conn.execute(table.update().where(table.c.id == 1).values(**values)).rowcount:
+        conn.execute(table.insert().values(id=1, **values))
+
+
+def current_version() -> int:
+    with engine.connect() as conn:
+        return _read_version(conn)
+
+
+def migrate() -> int:
+    """Apply pending migrations in order and record the resulting version."""
+    if current_version() == SCHEMA_VERSION:
+        return SCHEMA_VERSION
+    with _migration_lock() as conn:
+        # Re-read under the lock: another worker may have migrated while we waited
+        version = _read_version(conn)
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[target](conn)
+            _write_version(conn, target)
+            print(f"✅ Migrated database schema to version {target}")
+    return SCHEMA_VERSION
+
+
+def check_schema():
+    """Fail fast at startup instead of running DDL on every boot."""
+    version = current_version()
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {SCHEMA_VERSION}. Run `python migrations.py`."
+        )
+
+
+if __name__ == "__main__":
+    migrate()
+    print(f"Database schema is at version {current_version()}")
@@ -0,0 +1,82 @@
+import os
+from datetime import datetime
+
+from changelog_generator import generate_range_changelog, save_range_changelog
+from cluster import claim, owns, release
+from database import PrimarySessionLocal, Project, Repository, Notification
+from email_service import email_service
+from github_service import github_service
+from scheduler import in_background, scheduler
+
+POLL_INTERVAL_MINUTES = int(os.getenv("POLL_INTERVAL_MINUTES", "15"))
+# Long enough to cover one repository's GitHub round-trips plus generation
+POLL_LEASE_SECONDS = int(os.getenv("POLL_LEASE_SECONDS", "300"))
+
+
+def poll_repository(db, repository: Repository):
+    """Generate a changelog when a new release tag appeared since the last generated version."""
+    latest = github_service.get_latest_release_tag(repository.owner, repository.name, repository.github_token)
+    repository.last_checked = datetime.utcnow()
+    if not latest or latest == repository.last_changelog_version:
+        db.commit()
+        return
+    if not repository.last_changelog_version:
+        # First sighting: record a baseline instead of summarising the whole history
+        repository.last_changelog_version = latest
+        db.commit()
+        return
+
+    result = generate_range_changelog(repository.owner, repository.name, repository.github_token,
+                                      repository.last_changelog_version, latest)
+    changelog = save_range_changelog(db, repository, result)
+    project = repository.project
+
+    db.add(Notification(
+        user_id=project.user_id,
+        project_id=project.id,
+        title=f"New changelog for {repository.full_name}",
+        message=f"{changelog.version} generated from {changelog.pr_count} pull requests",
+        type="success",
+        timestamp=datetime.utcnow(),
+        read=False
+    ))
+    db.commit()
+    print(f"✅ Generated {changelog.version} for {repository.full_name}")
+
+    if project.email_notifications and project.user_email:
+        changes = [item for section in result["sections"].values() for item in section]
+        email_service.send_changelog_notification(
+            project.user_email, repository.full_name, changelog.version, changes[:20], changelog.pr_count
+        )
+
+
+def poll_repositories():
+    """Poll the repositories the hash ring assigns to this node, each under a lease."""
+    db = PrimarySessionLocal()
+    try:
+        repo_ids = [repo_id for (repo_id,) in db.query(Repository.id).join(Project).filter(
+            Repository.auto_gen_enabled == True,
+            Project.auto_generation == True
+        ).all()]
+        polled = 0
+        for repo_id in repo_ids:
+            if not owns(repo_id) or not claim(db, repo_id, POLL_LEASE_SECONDS):
+                continue
+            try:
+                repository = db.query(Repository).filter(Repository.id == repo_id).first()
+                if repository:
+                    poll_repository(db, repository)
+                    polled += 1
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Failed to poll repository {repo_id}: {e}")
+            finally:
+                release(db, repo_id)
+        if polled:
+            print(f"🔎 Polled {polled}/{len(repo_ids)} repositories")
+    finally:
+        db.close()
+
+
+def schedule_polling():
+    scheduler.every(POLL_INTERVAL_MINUTES).minutes.do(in_background("poll", poll_repositories))
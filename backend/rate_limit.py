@@ -0,0 +1,198 @@
+import json
+import os
+import time
+import uuid
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from auth import verify_token
+
+
+class RateLimitPolicy:
+    def __init__(self, limit: int, window_seconds: int, scope: str = "user"):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.scope = scope  # "user" (falls back to IP when unauthenticated) or "ip"
+
+    @classmethod
+    def parse(cls, value: str, scope: str = "user") -> "RateLimitPolicy":
+        """Build a policy from a "<limit>/<seconds>" string such as "300/60"."""
+        limit, window = value.split("/")
+        return cls(int(limit), int(window), scope)
+
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+DEFAULT_POLICY = RateLimitPolicy.parse(os.getenv("RATE_LIMIT_DEFAULT", "300/60"))
+
+GENERATE_POLICY = RateLimitPolicy.parse(os.getenv("RATE_LIMIT_GENERATE", "20/60"))
+
+# Expensive endpoints get their own, tighter budgets: bcrypt, the GitHub API and SMTP
+ROUTE_POLICIES: Dict[Tuple[str, str], RateLimitPolicy] = {
+    ("POST", "/auth/login"): RateLimitPolicy.parse(os.getenv("RATE_LIMIT_LOGIN", "10/60"), scope="ip"),
+    ("POST", "/auth/refresh"): RateLimitPolicy.parse(os.getenv("RATE_LIMIT_REFRESH", "30/60"), scope="ip"),
+    ("POST", "/auth/register"): RateLimitPolicy.parse(os.getenv("RATE_LIMIT_REGISTER", "5/300"), scope="ip"),
+    ("POST", "/changelogs/generate"): GENERATE_POLICY,
+    ("POST", "/changelogs/generate/range"): GENERATE_POLICY,
+    ("POST", "/repositories/connect/bulk"): RateLimitPolicy.parse(os.getenv("RATE_LIMIT_BULK_CONNECT", "5/60")),
+    ("POST", "/email/test"): RateLimitPolicy.parse(os.getenv("RATE_LIMIT_EMAIL_TEST", "3/300")),
+}
+
+# Routes drawing on one budget share a bucket; both generation routes call the LLM
+SHARED_BUCKETS: Dict[Tuple[str, str], str] = {
+    ("POST", "/changelogs/generate"): "generate",
+    ("POST", "/changelogs/generate/range"): "generate",
+}
+
+EXEMPT_PATHS = {"/health"}
+
+
+class InMemoryRateLimitStore:
+    """Sliding-window log kept in process memory; correct for a single worker only."""
+
+    def __init__(self):
+        self.hits: Dict[str, deque] = {}
+        self.last_sweep = time.monotonic()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, int, int]:
+        # No awaits below, so this is atomic with respect to other requests on the event loop
+        now = time.monotonic()
+        window = self.hits.setdefault(key, deque())
+        while window and window[0] <= now - window_seconds:
+            window.popleft()
+        if len(window) >= limit:
+            retry_after = int(window[0] + window_seconds - now) + 1
+            return False, 0, retry_after
+        window.append(now)
+        self._sweep(now)
+        return True, limit - len(window), 0
+
+    def _sweep(self, now: float):
+        # Drop idle keys once a minute so memory tracks active clients, not all clients ever seen
+        if now - self.last_sweep < 60:
+            return
+        self.last_sweep = now
+        longest = max([DEFAULT_POLICY.window_seconds] + [p.window_seconds for p in ROUTE_POLICIES.values()])
+        for key in [k for k, w in self.hits.items() if not w or w[-1] <= now - longest]:
+            del self.hits[key]
+
+
+# Atomic sliding window on a sorted set: trim, count, conditionally add
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return {0, 0, math.ceil(tonumber(oldest[2]) + window - now)}
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, math.ceil(window * 1000))
+return {1, limit - count - 1, 0}
+"""
+
+
+class RedisRateLimitStore:
+    """Sliding window shared by every worker and node through Redis."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url)
+        self.script = self.redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> Tuple[bool, int, int]:
+        try:
+            allowed, remaining, retry_after = await self.script(
+                keys=[f"aria:ratelimit:{key}"],
+                args=[time.time(), window_seconds, limit, uuid.uuid4().hex],
+            )
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the whole API down
+            print(f"⚠️  Rate limit store unavailable: {e}")
+            return True, limit, 0
+        return bool(allowed), int(remaining), int(retry_after)
+
+
+def create_rate_limit_store():
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        return RedisRateLimitStore(redis_url)
+    return InMemoryRateLimitStore()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-route policies before the request reaches the app."""
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or create_rate_limit_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED or scope["path"] in EXEMPT_PATHS \
+                or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route = (scope["method"], scope["path"].rstrip("/") or "/")
+        policy = ROUTE_POLICIES.get(route, DEFAULT_POLICY)
+        if route in SHARED_BUCKETS:
+            bucket = SHARED_BUCKETS[route]
+        else:
+            bucket = f"{route[0]}:{route[1]}" if route in ROUTE_POLICIES else "default"
+        key = f"{bucket}:{self._client_key(scope, policy)}"
+
+        allowed, remaining, retry_after = await self.store.hit(key, policy.limit, policy.window_seconds)
+        limit_headers = [
+            (b"x-ratelimit-limit", str(policy.limit).encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+        ]
+
+        if not allowed:
+            body = json.dumps({"detail": "Rate limit exceeded. Try again later."}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                ] + limit_headers,
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + limit_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _client_key(self, scope, policy: RateLimitPolicy) -> str:
+        if policy.scope == "user":
+            user_id = self._user_id(scope)
+            if user_id:
+                return f"user:{user_id}"
+        return f"ip:{self._client_ip(scope)}"
+
+    @staticmethod
+    def _user_id(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    return verify_token(token)
+        return None
+
+    @staticmethod
+    def _client_ip(scope) -> str:
+        if RATE_LIMIT_TRUST_PROXY:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from database import PrimarySessionLocal, engine, Project, Changelog, Notification, RetentionPolicy
+from auth import purge_expired_refresh_tokens
+from cluster import singleton
+from counters import apply_deltas, counter_deltas
+from scheduler import in_background, scheduler
+
+# Server-wide defaults, overridable per project through RetentionPolicy (0 = keep forever)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+CHANGELOG_RETENTION_DAYS = int(os.getenv("CHANGELOG_RETENTION_DAYS", "0"))
+
+# Small batches keep each write transaction (and SQLite's write lock) short
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_INTERVAL_HOURS = int(os.getenv("RETENTION_INTERVAL_HOURS", "6"))
+VACUUM_INTERVAL_DAYS = int(os.getenv("VACUUM_INTERVAL_DAYS", "7"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")
+
+# (model, age column, policy field)
+RETAINED_TABLES = [
+    (Notification, Notification.timestamp, "notification_days"),
+    (Changelog, Changelog.generated_at, "changelog_days"),
+]
+
+
+def _row_to_dict(row) -> Dict:
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        data[column.name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def _archive_path(table: str, project_id: str) -> str:
+    directory = os.path.join(ARCHIVE_DIR, table)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{project_id}-{datetime.utcnow().strftime('%Y%m%d')}.ndjson.gz")
+
+
+def purge_table(db, model, timestamp_column, project_id: str, days: int, archive: bool = True) -> int:
+    """Archive and delete rows older than `days` for one project, one small transaction per batch."""
+    if not days:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    primary_key = model.__table__.primary_key.columns.values()[0]
+    deleted = 0
+    while True:
+        rows = db.query(model).filter(
+            model.project_id == project_id,
+            timestamp_column < cutoff
+        ).order_by(timestamp_column).limit(RETENTION_BATCH_SIZE).all()
+        if not rows:
+            break
+        if archive:
+            # Appending a new gzip member per batch keeps the file a valid gzip stream
+            with gzip.open(_archive_path(model.__tablename__, project_id), "at", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(_row_to_dict(row)) + "\n")
+        ids = [getattr(row, primary_key.name) for row in rows]
+        db.query(model).filter(primary_key.in_(ids)).delete(synchronize_session=False)
+        # Bulk deletes bypass the flush hook, so adjust the counters in the same transaction
+        apply_deltas(db, counter_deltas(rows, -1))
+        db.commit()
+        db.expunge_all()
+        deleted += len(ids)
+        if len(rows) < RETENTION_BATCH_SIZE:
+            break
+    return deleted
+
+
+def get_retention_policy(db, project_id: str) -> Dict:
+    policy = db.query(RetentionPolicy).filter(RetentionPolicy.project_id == project_id).first()
+    return {
+        "notification_days": NOTIFICATION_RETENTION_DAYS if not policy or policy.notification_days is None else policy.notification_days,
+        "changelog_days": CHANGELOG_RETENTION_DAYS if not policy or policy.changelog_days is None else policy.changelog_days,
+        "archive": True if not policy or policy.archive is None else policy.archive,
+    }
+
+
+def run_retention(project_id: Optional[str] = None) -> Dict[str, int]:
+    db = PrimarySessionLocal()
+    totals = {model.__tablename__: 0 for model, _, _ in RETAINED_TABLES}
+    try:
+        query = db.query(Project.id)
+        if project_id:
+            query = query.filter(Project.id == project_id)
+        project_ids = [pid for (pid,) in query.all()]
+        for pid in project_ids:
+            policy = get_retention_policy(db, pid)
+            for model, timestamp_column, policy_field in RETAINED_TABLES:
+                totals[model.__tablename__] += purge_table(
+                    db, model, timestamp_column, pid, policy[policy_field], policy["archive"]
+                )
+        totals["refresh_tokens"] = purge_expired_refresh_tokens(db)
+    finally:
+        db.close()
+
+    if any(totals.values()):
+        print(f"🧹 Retention removed {totals}")
+        analyze_database()
+    return totals
+
+
+def analyze_database():
+    # Refresh planner statistics so listing queries keep picking the right indexes
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def vacuum_database():
+    # VACUUM cannot run inside a transaction, on SQLite or PostgreSQL
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM"))
+    print("🧹 Database vacuumed")
+
+
+def schedule_retention():
+    # Database-wide maintenance: one node runs it, not every node in the cluster
+    scheduler.every(RETENTION_INTERVAL_HOURS).hours.do(
+        in_background("retention", singleton("retention", run_retention))
+    )
+    if VACUUM_INTERVAL_DAYS:
+        scheduler.every(VACUUM_INTERVAL_DAYS).days.at("03:00").do(
+            in_background("vacuum", singleton("vacuum", vacuum_database))
+        )
@@ -0,0 +1,72 @@
+import os
+import threading
+from typing import Callable
+
+import schedule
+
+# Seconds between checks for due jobs
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", "5"))
+
+# Shared scheduler for periodic maintenance jobs (retention, backups, ...)
+scheduler = schedule.Scheduler()
+
+_thread = None
+_stop = threading.Event()
+
+# Names of background jobs currently running
+_running = set()
+_running_lock = threading.Lock()
+
+
+def _run():
+    while not _stop.is_set():
+        try:
+            scheduler.run_pending()
+        except Exception as e:
+            # A failing job must not take the loop (and every other job) down with it
+            print(f"❌ Scheduled job failed: {e}")
+        _stop.wait(SCHEDULER_TICK_SECONDS)
+
+
+def start_scheduler():
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="aria-scheduler", daemon=True)
+    _thread.start()
+    print(f"⏰ Scheduler started with {len(scheduler.get_jobs())} jobs")
+
+
+def stop_scheduler():
+    _stop.set()
+    if _thread:
+        _thread.join(timeout=5)
+
+
+def in_background(name: str, job: Callable) -> Callable:
+    """Wrap a long job so the ticking thread only starts it on its own thread.
+
+    Polling, retention, VACUUM and backups can run for minutes; run inline they would
+    delay every other job. A run that is still going when the job comes due again is
+    skipped rather than stacked.
+    """
+    def run(*args, **kwargs):
+        with _running_lock:
+            if name in _running:
+                print(f"⏭️  Skipping {name}: previous run still in progress")
+                return
+            _running.add(name)
+
+        def target():
+            try:
+                job(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ Scheduled job {name} failed: {e}")
+            finally:
+                with _running_lock:
+                    _running.discard(name)
+
+        threading.Thread(target=target, name=f"aria-job-{name}", daemon=True).start()
+    run.__name__ = f"background_{name}"
+    return run
@@ -0,0 +1,77 @@
+"""Production entry point: a gunicorn master preloads the app and forks Uvicorn workers.
+
+    python serve.py --workers 4
+
+Preloading imports FastAPI, SQLAlchemy and every route module once in the master,
+so forked workers share those pages copy-on-write and start in milliseconds. Schema
+migrations also run once in the master rather than racing in every worker.
+"""
+import argparse
+import multiprocessing
+import os
+
+import config  # noqa: F401  (loads .env before HOST, PORT and WEB_CONCURRENCY are read)
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared across processes
+    from database import engine, replica_engines
+    engine.dispose()
+    for replica in replica_engines:
+        replica.dispose()
+
+
+def run_gunicorn(workers: int, bind: str):
+    from gunicorn.app.base import BaseApplication
+
+    from main import app
+
+    class AriaApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", bind)
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("post_fork", post_fork)
+            self.cfg.set("timeout", int(os.getenv("WORKER_TIMEOUT", "60")))
+            self.cfg.set("graceful_timeout", int(os.getenv("GRACEFUL_TIMEOUT", "30")))
+            self.cfg.set("keepalive", int(os.getenv("KEEPALIVE_SECONDS", "5")))
+
+        def load(self):
+            return app
+
+    AriaApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ARIA API with multiple workers")
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+
+    from migrations import migrate
+    migrate()
+    os.environ["AUTO_MIGRATE"] = "false"
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        # Windows / dev installs without gunicorn: uvicorn's own supervisor, no preloading
+        import uvicorn
+        print("⚠️  gunicorn not installed; falling back to uvicorn workers without preloading")
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+        return
+
+    run_gunicorn(args.workers, f"{args.host}:{args.port}")
+
+
+if __name__ == "__main__":
+    main()
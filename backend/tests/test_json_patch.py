@@ -0,0 +1,119 @@
+import pytest
+
+from json_patch import JsonPatchError, apply_patch
+
+
+def changelog():
+    return {
+        "title": "Release 1.2.0",
+        "features": ["Dark mode", "Export to Atom"],
+        "fixes": ["Crash on login"],
+        "meta": {"a/b": 1, "m~n": 2},
+    }
+
+
+def test_add_to_object_and_array():
+    result = apply_patch(changelog(), [
+        {"op": "add", "path": "/description", "value": "Summary"},
+        {"op": "add", "path": "/features/1", "value": "Webhooks"},
+    ])
+    assert result["description"] == "Summary"
+    assert result["features"] == ["Dark mode", "Webhooks", "Export to Atom"]
+
+
+def test_add_with_dash_appends():
+    result = apply_patch(changelog(), [{"op": "add", "path": "/fixes/-", "value": "Typo in footer"}])
+    assert result["fixes"] == ["Crash on login", "Typo in footer"]
+
+
+def test_dash_is_not_an_existing_element():
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), [{"op": "remove", "path": "/fixes/-"}])
+
+
+def test_remove():
+    result = apply_patch(changelog(), [{"op": "remove", "path": "/features/0"}])
+    assert result["features"] == ["Export to Atom"]
+
+
+def test_replace():
+    result = apply_patch(changelog(), [{"op": "replace", "path": "/title", "value": "Release 1.2.1"}])
+    assert result["title"] == "Release 1.2.1"
+
+
+def test_replace_missing_path_fails():
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), [{"op": "replace", "path": "/missing", "value": "x"}])
+
+
+def test_move():
+    result = apply_patch(changelog(), [{"op": "move", "from": "/fixes/0", "path": "/features/-"}])
+    assert result["fixes"] == []
+    assert result["features"] == ["Dark mode", "Export to Atom", "Crash on login"]
+
+
+def test_move_into_own_child_fails():
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), [{"op": "move", "from": "/meta", "path": "/meta/inner"}])
+
+
+def test_move_to_sibling_with_shared_prefix():
+    result = apply_patch(changelog(), [{"op": "move", "from": "/fixes", "path": "/fixes2"}])
+    assert "fixes" not in result and result["fixes2"] == ["Crash on login"]
+
+
+def test_copy():
+    result = apply_patch(changelog(), [{"op": "copy", "from": "/features", "path": "/highlights"}])
+    result["highlights"].append("Changed")
+    assert result["features"] == ["Dark mode", "Export to Atom"]
+
+
+def test_test_op():
+    assert apply_patch(changelog(), [{"op": "test", "path": "/fixes/0", "value": "Crash on login"}]) == changelog()
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), [{"op": "test", "path": "/fixes/0", "value": "Other"}])
+
+
+def test_pointer_escaping():
+    result = apply_patch(changelog(), [
+        {"op": "replace", "path": "/meta/a~1b", "value": 10},
+        {"op": "replace", "path": "/meta/m~0n", "value": 20},
+    ])
+    assert result["meta"] == {"a/b": 10, "m~n": 20}
+
+
+def test_failed_patch_changes_nothing():
+    document = changelog()
+    with pytest.raises(JsonPatchError):
+        apply_patch(document, [
+            {"op": "add", "path": "/features/-", "value": "Applied first"},
+            {"op": "remove", "path": "/missing"},
+        ])
+    assert document == changelog()
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "add", "path": 5, "value": "x"},
+    {"op": "remove", "path": None},
+    {"op": "move", "from": None, "path": "/title"},
+    {"op": "copy", "from": 3, "path": "/title"},
+    {"op": "move", "from": "/title", "path": ["/x"]},
+    {"op": "remove", "path": "/features/²"},
+    {"op": "remove", "path": "/features/01"},
+    {"op": "remove", "path": "/features/5"},
+    {"op": "remove", "path": "features/0"},
+    {"op": "remove", "path": ""},
+    {"op": "add", "path": "/title/x", "value": 1},
+    {"op": "frobnicate", "path": "/title"},
+    {"op": "add", "path": "/title"},
+    {"path": "/title"},
+    "remove /title",
+])
+def test_malformed_operations_raise_patch_error(operation):
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), [operation])
+
+
+def test_patch_must_be_a_list():
+    with pytest.raises(JsonPatchError):
+        apply_patch(changelog(), {"op": "remove", "path": "/title"})